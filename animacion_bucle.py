@@ -0,0 +1,142 @@
+from manim import (DOWN, GRAY, GREEN, ORANGE, RED, RIGHT, UP, WHITE, YELLOW, FadeIn,
+                   ReplacementTransform, VGroup, Write)
+from contador import Etiqueta
+from traza_bucle import iteraciones, planificar
+
+# Animación de una traza de bucle (traza_bucle.py) dentro de una escena.
+# Arriba a la derecha las variables del script (las que cambian en amarillo)
+# y la condición del bucle; a la derecha del código, la "consola" con lo que
+# imprime. Cada iteración detallada son tres animaciones cortas (variables,
+# condición, print); los tramos del medio se recorren con un salto por
+# segmento del plan, así que un bucle de 10.000 vueltas cuesta lo mismo que
+# uno de 20.
+
+def _texto_valor(valor):
+    return '—' if valor is None else str(valor)
+
+class AnimacionBucle:
+    def __init__(self, escena, traza, base_consola, separacion=0.39,
+                 inicio=6, fin=6, saltos=3):
+        self.escena = escena
+        self.traza = traza
+        self.base_consola = base_consola
+        self.separacion = separacion
+        self.plan = planificar(iteraciones(traza), inicio, fin, saltos)
+        estados = traza['estados']
+        cambian = [any(e[k] != estados[0][k] for e in estados) for k in range(len(traza['variables']))]
+        # Las variables que cambian primero, como en las demos originales
+        self.orden = sorted(range(len(cambian)), key=lambda k: not cambian[k])
+        self.colores = [YELLOW if cambian[k] else WHITE for k in self.orden]
+        self.etiquetas = []
+        self.consola = VGroup()
+        self.lineas_consola = 0
+        self.etiqueta_salto = None
+        self.saltadas = 0
+
+    def _texto_variable(self, k, estado):
+        return f"{self.traza['variables'][k]} = {_texto_valor(estado[k])}"
+
+    def _texto_condicion(self, continua):
+        return f"{self.traza['condicion']} → {continua}"
+
+    # Texto y color del panel de la condición en la evaluación i; si el bucle
+    # terminó con break, la última no es la condición sino el break
+    def _condicion(self, i):
+        continua = self.traza['continua'][i]
+        if self.traza.get('break') and i == len(self.traza['estados']) - 1:
+            return 'break', ORANGE
+        return self._texto_condicion(continua), GREEN if continua else RED
+
+    # Ubicar la etiqueta i del panel de variables (la condición es la última)
+    def _ubicar(self, i, etiqueta):
+        if i == 0:
+            return etiqueta.to_corner(UP + RIGHT)
+        return etiqueta.next_to(self.etiquetas[i - 1], DOWN, aligned_edge=RIGHT)
+
+    # Reemplazar las etiquetas cuyo texto cambió; devuelve las animaciones
+    def _actualizar(self, indices, textos):
+        animaciones = []
+        for i, texto in zip(indices, textos):
+            vieja = self.etiquetas[i]
+            if texto == vieja.texto:
+                continue
+            nueva = self._ubicar(i, vieja.con_texto(texto))
+            animaciones.append(ReplacementTransform(vieja, nueva))
+            self.etiquetas[i] = nueva
+        return animaciones
+
+    def _linea_consola(self, texto, color, extra=0.0):
+        linea = Etiqueta(texto, font_size=30, color=color)
+        linea.move_to(self.base_consola + DOWN * (self.separacion * self.lineas_consola + extra))
+        self.lineas_consola += 1
+        self.consola.add(linea)
+        return linea
+
+    # Panel inicial: variables y condición en la primera evaluación
+    def presentar(self):
+        estado = self.traza['estados'][0]
+        texto, color = self._condicion(0)
+        for i, k in enumerate(self.orden):
+            self.etiquetas.append(self._ubicar(i, Etiqueta(self._texto_variable(k, estado),
+                                                          font_size=34, color=self.colores[i])))
+        condicion = Etiqueta(texto, font_size=28, color=color)
+        self.escena.play(*[FadeIn(m) for m in self.etiquetas])
+        self.escena.wait(0.3)
+        self.etiquetas.append(self._ubicar(len(self.orden), condicion))
+        self.escena.play(FadeIn(condicion))
+        self.escena.wait(0.3)
+
+    # Estado después de la iteración i (la evaluación i + 1)
+    def _mostrar_estado(self, i, tiempo_variables, tiempo_condicion):
+        estado = self.traza['estados'][i + 1]
+        texto, color = self._condicion(i + 1)
+        variables = self._actualizar(range(len(self.orden)),
+                                     [self._texto_variable(k, estado) for k in self.orden])
+        if variables:
+            self.escena.play(*variables, run_time=tiempo_variables)
+        condicion = ReplacementTransform(self.etiquetas[-1], self._ubicar(
+            len(self.orden), self.etiquetas[-1].con_texto(texto, color=color)))
+        self.etiquetas[-1] = condicion.target_mobject
+        self.escena.play(condicion, run_time=tiempo_condicion)
+
+    def _detalle(self, i):
+        self._mostrar_estado(i, 0.13, 0.12)
+        lineas = [self._linea_consola(t, GREEN) for t in self.traza['salidas'][i].splitlines()]
+        if lineas:
+            self.escena.play(*[Write(l) for l in lineas], run_time=0.15)
+        self.escena.wait(0.09)
+
+    # Tramo [desde, hasta) de una sola vez: variables al final del tramo y
+    # una línea de consola con la cuenta de iteraciones saltadas
+    def _salto(self, desde, hasta):
+        self.saltadas += hasta - desde
+        texto = f"⋮  ({self.saltadas} iteraciones)"
+        if self.etiqueta_salto is None:
+            self.etiqueta_salto = self._linea_consola(texto, GRAY)
+            animacion = Write(self.etiqueta_salto)
+        else:
+            nueva = self.etiqueta_salto.con_texto(texto).move_to(self.etiqueta_salto)
+            animacion = ReplacementTransform(self.etiqueta_salto, nueva)
+            self.consola.remove(self.etiqueta_salto)
+            self.consola.add(nueva)
+            self.etiqueta_salto = nueva
+        self.escena.play(animacion, run_time=0.15)
+        self._mostrar_estado(hasta - 1, 0.3, 0.12)
+
+    def animar(self):
+        if not self.etiquetas:
+            self.presentar()
+        for tipo, desde, hasta in self.plan:
+            if tipo == 'detalle':
+                self._detalle(desde)
+            else:
+                self._salto(desde, hasta)
+        lineas = [self._linea_consola(t, ORANGE, extra=0.18)
+                  for t in self.traza['salida_despues'].splitlines()]
+        if lineas:
+            self.escena.play(*[Write(l) for l in lineas], run_time=0.22)
+        return self
+
+    # Todo lo que dejó en pantalla, para sacarlo al final de la escena
+    def mobjects(self):
+        return [*self.etiquetas, *self.consola]
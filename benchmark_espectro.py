@@ -0,0 +1,362 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from simulador_espectro import (IndiceTransiciones, calcular_transiciones_arrays,
+                                generar_espectro, guardar_transiciones, leer_niveles_arrays,
+                                redondear_transiciones, transiciones_a_dicts,
+                                visibles_redondeadas)
+
+# Benchmarks del pipeline del simulador, etapa por etapa:
+#   leer     → leer_niveles_arrays sobre un CSV sintético
+#   calcular → calcular_transiciones_arrays
+#   generar  → RenderizadorEspectro.renderizar (Agg, sin ventana)
+#   guardar  → guardar_transiciones (CSV)
+# Los niveles sintéticos siguen la fórmula del hidrógeno que usa
+# crear_csv_hidrogeno (E_n = -13.6 / n² eV). Cada medición guarda el mejor
+# tiempo de varias repeticiones y el pico de memoria (tracemalloc).
+# Las etapas que dependen de las transiciones se omiten cuando N·(N-1)/2
+# supera --max-pares: con 10⁶ niveles serían 5·10¹¹ pares.
+# --arranque mide en cambio el tiempo de arranque de cada subcomando del CLI
+# de simulador_espectro.py (proceso nuevo) y si llegó a importar matplotlib.
+# --escritura compara guardar_transiciones con el escritor original
+# (csv.DictWriter sobre dicts), desde dicts y desde el arreglo, por formato.
+# --figuras compara figuras por segundo de generar_espectro(mostrar=False),
+# que arma una figura de pyplot por espectro, con RenderizadorEspectro, que
+# reutiliza la misma.
+
+TAMANOS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+ETAPAS = ('leer', 'calcular', 'generar', 'guardar')
+SUBCOMANDOS_ARRANQUE = {
+    'python': None,
+    'numpy': None,
+    'levels': ['levels'],
+    'transitions': ['transitions', '--visibles'],
+    'export': ['export', '--visibles', '-o', 'visibles.csv'],
+    'render': ['render', '-o', 'espectro.png']
+}
+NIVELES_ESCRITURA = 800  # 319.600 transiciones
+FORMATOS_ESCRITURA = ('csv', 'csv.gz', 'npy', 'npz', 'bin')
+FIGURAS = 20  # espectros por caso en --figuras
+NIVELES_FIGURAS = 30
+
+# Escribir un CSV de niveles sintéticos con el formato de crear_csv_hidrogeno
+def crear_csv_sintetico(archivo, niveles):
+    n = np.arange(1, niveles + 1)
+    energias = -13.6 / n ** 2
+    with open(archivo, 'w', newline='') as f:
+        f.write('nivel_principal,energia,symbol\n')
+        np.savetxt(f, np.column_stack([n, energias]), fmt='%d,%.10g,X')
+
+# Medir una función: mejor tiempo de `repeticiones` y pico de memoria
+def medir(funcion, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, min(tiempos), pico
+
+# Correr todas las etapas para cada tamaño
+def correr_benchmarks(tamanos=TAMANOS, etapas=ETAPAS, repeticiones=3, max_pares=20_000_000):
+    resultados = []
+    renderizador = None
+    with tempfile.TemporaryDirectory() as temporal:
+        for niveles in tamanos:
+            pares = niveles * (niveles - 1) // 2
+            archivo_csv = os.path.join(temporal, f'niveles_{niveles}.csv')
+            crear_csv_sintetico(archivo_csv, niveles)
+
+            (numeros, energias), segundos, pico = medir(
+                lambda: leer_niveles_arrays(archivo_csv), repeticiones)
+            if 'leer' in etapas:
+                resultados.append(_resultado('leer', niveles, pares, segundos, pico))
+
+            if pares > max_pares:
+                for etapa in ('calcular', 'generar', 'guardar'):
+                    if etapa in etapas:
+                        resultados.append(_resultado(etapa, niveles, pares, None, None, omitida=True))
+                print(f"{niveles:>9} niveles listos (solo lectura)")
+                continue
+
+            transiciones, segundos, pico = medir(
+                lambda: calcular_transiciones_arrays(energias, numeros), repeticiones)
+            if 'calcular' in etapas:
+                resultados.append(_resultado('calcular', niveles, pares, segundos, pico))
+
+            if 'generar' in etapas:
+                if renderizador is None:
+                    from render_espectro import RenderizadorEspectro
+                    renderizador = RenderizadorEspectro()
+                archivo_png = os.path.join(temporal, 'espectro.png')
+                _, segundos, pico = medir(
+                    lambda: renderizador.renderizar(IndiceTransiciones(transiciones), archivo_png),
+                    repeticiones)
+                resultados.append(_resultado('generar', niveles, pares, segundos, pico))
+
+            if 'guardar' in etapas:
+                archivo_salida = os.path.join(temporal, 'transiciones.csv')
+                _, segundos, pico = medir(
+                    lambda: guardar_transiciones(transiciones, archivo_salida), repeticiones)
+                resultados.append(_resultado('guardar', niveles, pares, segundos, pico))
+            print(f"{niveles:>9} niveles listos")
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'repeticiones': repeticiones,
+            'max_pares': max_pares
+        },
+        'resultados': resultados
+    }
+
+# Arranque de cada subcomando: mejor tiempo de pared de `repeticiones`
+# procesos nuevos, con el intérprete solo y numpy solo como referencia
+def medir_arranque(repeticiones=5, subcomandos=SUBCOMANDOS_ARRANQUE):
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'simulador_espectro.py')
+    referencias = {'python': ['-c', 'pass'], 'numpy': ['-c', 'import numpy']}
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporal:
+        # Crear el CSV y llenar la caché antes de medir
+        subprocess.run([sys.executable, script, 'transitions', '-o', 'previa.csv'],
+                       cwd=temporal, check=True, capture_output=True)
+        for nombre, argumentos in subcomandos.items():
+            comando = referencias[nombre] if argumentos is None else [script, *argumentos]
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                subprocess.run([sys.executable, *comando], cwd=temporal, check=True,
+                               capture_output=True)
+                tiempos.append(time.perf_counter() - inicio)
+            importaciones = subprocess.run([sys.executable, '-X', 'importtime', *comando],
+                                           cwd=temporal, check=True, capture_output=True,
+                                           text=True).stderr
+            modulos = [linea.rsplit('|', 1)[-1].strip() for linea in importaciones.splitlines()
+                       if linea.startswith('import time:')]
+            resultados.append({'subcomando': nombre, 'segundos': min(tiempos),
+                               'modulos_importados': len(modulos) - 1,
+                               'matplotlib': any(m.split('.')[0] == 'matplotlib' for m in modulos)})
+    return resultados
+
+# Escritor original de simulador_espectro.py, como referencia
+def _guardar_dictwriter(transiciones, archivo_salida):
+    with open(archivo_salida, 'w', newline='') as f:
+        campos = ['inicial', 'final', 'energia_eV', 'longitud_onda_nm']
+        writer = csv.DictWriter(f, fieldnames=campos)
+        writer.writeheader()
+        writer.writerows(transiciones)
+
+# Escritura de las transiciones de `niveles` niveles sintéticos: el escritor
+# original, guardar_transiciones desde la lista de dicts y desde el arreglo
+# (ya redondeado, como en el pipeline) en cada formato
+def medir_escritura(niveles=NIVELES_ESCRITURA, repeticiones=3, formatos=FORMATOS_ESCRITURA):
+    n = np.arange(1, niveles + 1)
+    transiciones = redondear_transiciones(calcular_transiciones_arrays(-13.6 / n ** 2, n))
+    dicts = transiciones_a_dicts(transiciones)
+    casos = [('dictwriter', 'csv', lambda ruta: _guardar_dictwriter(dicts, ruta)),
+             ('dicts', 'csv', lambda ruta: guardar_transiciones(dicts, ruta))]
+    casos += [('arreglo', formato, lambda ruta: guardar_transiciones(transiciones, ruta))
+              for formato in formatos]
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for entrada, formato, escribir in casos:
+            ruta = os.path.join(temporal, f'{entrada}.{formato}')
+            _, segundos, pico = medir(lambda: escribir(ruta), repeticiones)
+            resultados.append({'entrada': entrada, 'formato': formato,
+                               'transiciones': len(transiciones), 'segundos': segundos,
+                               'memoria_pico_bytes': pico, 'bytes': os.path.getsize(ruta)})
+        # El CSV nuevo tiene que ser idéntico al del escritor original
+        with open(os.path.join(temporal, 'dictwriter.csv'), 'rb') as a, \
+                open(os.path.join(temporal, 'arreglo.csv'), 'rb') as b:
+            if a.read() != b.read():
+                raise AssertionError("El CSV de guardar_transiciones difiere del de csv.DictWriter")
+    return resultados
+
+# Figuras por segundo dibujando `figuras` espectros de `niveles` niveles:
+# generar_espectro (una figura de pyplot por espectro) contra
+# RenderizadorEspectro (una sola figura Agg reutilizada). Cada espectro usa
+# otras transiciones visibles, como un lote de datasets distintos.
+def medir_figuras(figuras=FIGURAS, niveles=NIVELES_FIGURAS, repeticiones=3):
+    import matplotlib
+    matplotlib.use('Agg')
+    from render_espectro import RenderizadorEspectro
+
+    n = np.arange(1, niveles + 1)
+    espectros = [visibles_redondeadas(IndiceTransiciones(
+        calcular_transiciones_arrays(-13.6 * (1 + 0.002 * i) / n ** 2, n), niveles=n))
+        for i in range(figuras)]
+    renderizador = RenderizadorEspectro()
+    casos = [('generar_espectro', lambda v, ruta: generar_espectro(v, ruta, mostrar=False)),
+             ('RenderizadorEspectro', renderizador.renderizar)]
+    resultados = []
+    with tempfile.TemporaryDirectory() as temporal:
+        for nombre, dibujar in casos:
+            rutas = [os.path.join(temporal, f'{nombre}_{i}.png') for i in range(figuras)]
+            def lote():
+                for visibles, ruta in zip(espectros, rutas):
+                    dibujar(visibles, ruta)
+            _, segundos, pico = medir(lote, repeticiones)
+            resultados.append({'caso': nombre, 'figuras': figuras,
+                               'lineas': len(espectros[0]), 'segundos': segundos,
+                               'figuras_por_segundo': figuras / segundos,
+                               'memoria_pico_bytes': pico})
+    renderizador.cerrar()
+    return resultados
+
+def _resultado(etapa, niveles, pares, segundos, pico, omitida=False):
+    return {'etapa': etapa, 'niveles': niveles, 'transiciones': pares,
+            'segundos': segundos, 'memoria_pico_bytes': pico, 'omitida': omitida}
+
+# Curvas de escala (tiempo y memoria vs. niveles, log-log) en un PNG
+def graficar_escalado(informe, archivo_salida):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 5))
+    FigureCanvasAgg(fig)
+    ax_t, ax_m = fig.subplots(1, 2)
+    for etapa in ETAPAS:
+        filas = [r for r in informe['resultados'] if r['etapa'] == etapa and not r['omitida']]
+        if not filas:
+            continue
+        niveles = [r['niveles'] for r in filas]
+        ax_t.plot(niveles, [r['segundos'] for r in filas], 'o-', label=etapa)
+        ax_m.plot(niveles, [r['memoria_pico_bytes'] / 1024 ** 2 for r in filas], 'o-', label=etapa)
+    for ax, titulo, ylabel in ((ax_t, 'Tiempo por etapa', 'Segundos'),
+                               (ax_m, 'Memoria pico por etapa', 'MiB')):
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_title(titulo, fontsize=12)
+        ax.set_xlabel('Niveles', fontsize=10)
+        ax.set_ylabel(ylabel, fontsize=10)
+        ax.grid(True, alpha=0.3)
+        ax.legend()
+    fig.tight_layout()
+    fig.savefig(archivo_salida, dpi=120)
+
+# Comparar contra una línea base; devuelve las etapas que empeoraron.
+# Se ignoran diferencias menores a `minimo_segundos` (ruido en etapas rápidas).
+def comparar_con_baseline(informe, baseline, tolerancia=0.25, minimo_segundos=0.005):
+    base = {(r['etapa'], r['niveles']): r for r in baseline['resultados'] if not r['omitida']}
+    regresiones = []
+    for r in informe['resultados']:
+        anterior = base.get((r['etapa'], r['niveles']))
+        if r['omitida'] or anterior is None:
+            continue
+        limite = anterior['segundos'] * (1 + tolerancia)
+        if r['segundos'] > limite and r['segundos'] - anterior['segundos'] > minimo_segundos:
+            regresiones.append({**r, 'segundos_baseline': anterior['segundos'],
+                                'factor': r['segundos'] / anterior['segundos']})
+    return regresiones
+
+
+# Programa principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del pipeline de espectros")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=list(TAMANOS),
+                        help="Cantidades de niveles a medir")
+    parser.add_argument('--etapas', nargs='+', choices=ETAPAS, default=list(ETAPAS))
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--max-pares', type=int, default=20_000_000,
+                        help="Omitir etapas con más transiciones que esto")
+    parser.add_argument('-o', '--salida', default='benchmark_espectro.json',
+                        help="Archivo JSON con los resultados")
+    parser.add_argument('--grafico', default=None,
+                        help="PNG con las curvas de escala (por defecto, junto al JSON)")
+    parser.add_argument('--baseline', default=None,
+                        help="JSON de referencia; falla si alguna etapa empeora")
+    parser.add_argument('--tolerancia', type=float, default=0.25,
+                        help="Empeoramiento relativo permitido frente a la baseline")
+    parser.add_argument('--arranque', action='store_true',
+                        help="Medir solo el arranque de los subcomandos del CLI")
+    parser.add_argument('--escritura', type=int, nargs='?', const=NIVELES_ESCRITURA,
+                        default=None, metavar='NIVELES',
+                        help="Medir solo la escritura de transiciones (por defecto "
+                             f"{NIVELES_ESCRITURA} niveles)")
+    parser.add_argument('--figuras', type=int, nargs='?', const=FIGURAS, default=None,
+                        metavar='FIGURAS',
+                        help="Medir solo figuras por segundo de generar_espectro y "
+                             f"RenderizadorEspectro (por defecto {FIGURAS} espectros)")
+    args = parser.parse_args()
+
+    if args.figuras:
+        figuras = medir_figuras(args.figuras, repeticiones=args.repeticiones)
+        salida = args.salida if args.salida != 'benchmark_espectro.json' else 'benchmark_figuras.json'
+        with open(salida, 'w') as f:
+            json.dump({'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                                'plataforma': platform.platform(),
+                                'repeticiones': args.repeticiones},
+                       'figuras': figuras}, f, indent=2)
+        for r in figuras:
+            print(f"{r['caso']:>20}: {r['figuras_por_segundo']:6.2f} fig/s  "
+                  f"({r['figuras']} espectros de {r['lineas']} líneas en {r['segundos']:.2f} s)")
+        print(f"Resultados en '{salida}'")
+        raise SystemExit(0)
+
+    if args.escritura:
+        escritura = medir_escritura(args.escritura, args.repeticiones)
+        salida = args.salida if args.salida != 'benchmark_espectro.json' else 'benchmark_escritura.json'
+        with open(salida, 'w') as f:
+            json.dump({'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                                'plataforma': platform.platform(),
+                                'repeticiones': args.repeticiones},
+                       'escritura': escritura}, f, indent=2)
+        referencia = escritura[0]['segundos']
+        for r in escritura:
+            print(f"{r['entrada']:>10} → {r['formato']:<6}: {r['segundos'] * 1000:9.1f} ms  "
+                  f"x{referencia / r['segundos']:6.1f}  {r['bytes'] / 1024 ** 2:7.2f} MiB")
+        print(f"{escritura[0]['transiciones']} transiciones; resultados en '{salida}'")
+        raise SystemExit(0)
+
+    if args.arranque:
+        arranque = medir_arranque(max(args.repeticiones, 5))
+        salida = args.salida if args.salida != 'benchmark_espectro.json' else 'benchmark_arranque.json'
+        with open(salida, 'w') as f:
+            json.dump({'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                                'plataforma': platform.platform()},
+                       'arranque': arranque}, f, indent=2)
+        for r in arranque:
+            print(f"{r['subcomando']:>12}: {r['segundos'] * 1000:8.1f} ms  "
+                  f"{r['modulos_importados']:4d} módulos"
+                  + ("  (importa matplotlib)" if r['matplotlib'] else ''))
+        print(f"Resultados en '{salida}'")
+        raise SystemExit(0)
+
+    informe = correr_benchmarks(args.tamanos, args.etapas, args.repeticiones, args.max_pares)
+    with open(args.salida, 'w') as f:
+        json.dump(informe, f, indent=2)
+    grafico = args.grafico or os.path.splitext(args.salida)[0] + '.png'
+    graficar_escalado(informe, grafico)
+    print(f"Resultados en '{args.salida}', curvas en '{grafico}'")
+
+    for r in informe['resultados']:
+        if r['omitida']:
+            print(f"{r['etapa']:>9} {r['niveles']:>9} niveles: omitida")
+        else:
+            print(f"{r['etapa']:>9} {r['niveles']:>9} niveles: {r['segundos'] * 1000:10.2f} ms"
+                  f"  {r['memoria_pico_bytes'] / 1024 ** 2:9.2f} MiB")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regresiones = comparar_con_baseline(informe, json.load(f), args.tolerancia)
+        for r in regresiones:
+            print(f"REGRESIÓN {r['etapa']} con {r['niveles']} niveles: "
+                  f"{r['segundos_baseline'] * 1000:.2f} ms → {r['segundos'] * 1000:.2f} ms "
+                  f"(x{r['factor']:.2f})")
+        if regresiones:
+            raise SystemExit(1)
+        print("Sin regresiones frente a la baseline")
@@ -0,0 +1,99 @@
+import hashlib
+import math
+import os
+import pickle
+import tempfile
+import manim
+from manim import Code, ImageMobject, SVGMobject, config
+from manim.utils.images import get_full_raster_image_path, get_full_vector_image_path
+from PIL import Image
+
+# Caché de assets compartida por todas las escenas del proceso.
+# Cada asset se construye una sola vez (SVG parseado, código resaltado con
+# Pygments, imagen reducida a la resolución de salida) y se guarda como
+# plantilla; cada pedido recibe una copia barata. La clave incluye la ruta,
+# la fecha de modificación del archivo, los parámetros, la versión de manim
+# y la resolución de render, así que editar un asset invalida su entrada.
+# Las plantillas también se guardan en disco (pickle, y PNG para imágenes)
+# para que la próxima ejecución tampoco repita el trabajo.
+
+DIRECTORIO_CACHE_ASSETS = '.cache_assets'
+
+_plantillas = {}
+
+def _clave(tipo, ruta, **parametros):
+    estado = os.stat(ruta)
+    partes = (tipo, os.path.abspath(ruta), estado.st_mtime_ns, estado.st_size,
+              sorted((k, repr(v)) for k, v in parametros.items()),
+              manim.__version__, config.pixel_height, config.renderer)
+    return hashlib.sha256(repr(partes).encode()).hexdigest()
+
+def _ruta_disco(clave, extension):
+    return os.path.join(DIRECTORIO_CACHE_ASSETS, f'{clave}.{extension}')
+
+def _guardar_atomico(ruta, escribir):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), prefix='.tmp-')
+    try:
+        with os.fdopen(descriptor, 'wb') as f:
+            escribir(f)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+# Plantilla en memoria → en disco → construirla; siempre devuelve una copia
+def _obtener(clave, construir):
+    if clave not in _plantillas:
+        ruta = _ruta_disco(clave, 'pkl')
+        plantilla = None
+        if os.path.exists(ruta):
+            try:
+                with open(ruta, 'rb') as f:
+                    plantilla = pickle.load(f)
+            except Exception:
+                plantilla = None
+        if plantilla is None:
+            plantilla = construir()
+            try:
+                _guardar_atomico(ruta, lambda f: pickle.dump(plantilla, f, pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                pass  # algunos mobjects no se pueden serializar; queda solo en memoria
+        _plantillas[clave] = plantilla
+    return _plantillas[clave].copy()
+
+# SVG parseado una sola vez por archivo y parámetros
+def svg_cacheado(archivo, **kwargs):
+    ruta = get_full_vector_image_path(archivo)
+    return _obtener(_clave('svg', ruta, **kwargs), lambda: SVGMobject(ruta, **kwargs))
+
+# Bloque de código resaltado una sola vez por archivo y parámetros
+def codigo_cacheado(archivo, **kwargs):
+    return _obtener(_clave('code', archivo, **kwargs), lambda: Code(archivo, **kwargs))
+
+# Imagen ya escalada, con los píxeles reducidos a lo que realmente ocupa en
+# el video. Equivale a ImageMobject(archivo).scale(escala).
+def imagen_cacheada(archivo, escala=1.0):
+    ruta = get_full_raster_image_path(archivo)
+    clave = _clave('imagen', ruta, escala=escala)
+
+    def construir():
+        original = ImageMobject(ruta).scale(escala)
+        alto, ancho = original.pixel_array.shape[:2]
+        # Filas que la imagen ocupa en el cuadro de salida
+        filas = math.ceil(original.height / config.frame_height * config.pixel_height)
+        if filas >= alto:
+            return original
+
+        ruta_png = _ruta_disco(clave, 'png')
+        if not os.path.exists(ruta_png):
+            columnas = max(1, round(ancho * filas / alto))
+            reducida = Image.fromarray(original.pixel_array).resize((columnas, filas),
+                                                                     Image.Resampling.LANCZOS)
+            _guardar_atomico(ruta_png, lambda f: reducida.save(f, format='PNG'))
+        imagen = ImageMobject(ruta_png)
+        imagen.stretch_to_fit_height(original.height)
+        imagen.stretch_to_fit_width(original.width)
+        return imagen.move_to(original)
+
+    return _obtener(clave, construir)
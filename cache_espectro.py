@@ -0,0 +1,103 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import numpy as np
+from simulador_espectro import leer_niveles_arrays, calcular_transiciones_arrays, niveles_sin_repetir
+
+# Caché binaria en disco de niveles y transiciones.
+# Cada entrada es un directorio <hash>/ con tres .npy (niveles, energias,
+# transiciones) que se reabren con np.load(mmap_mode='r'), sin copiar datos.
+# La clave es el SHA-256 del contenido del CSV, así que si el archivo cambia
+# la entrada simplemente deja de coincidir y se reconstruye.
+
+DIRECTORIO_CACHE = '.cache_espectro'
+TAMANO_MAXIMO_CACHE = 512 * 1024 ** 2  # bytes
+VERSION_CACHE = 3  # subir si cambia el formato o el cálculo de transiciones
+ARCHIVOS_ENTRADA = ('niveles.npy', 'energias.npy', 'transiciones.npy')
+
+# Hash del contenido de un archivo, leído por bloques
+def hash_archivo(ruta, tamano_bloque=1 << 20):
+    h = hashlib.sha256(f'v{VERSION_CACHE}:'.encode())
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(tamano_bloque), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+# Abrir un .npy como memmap (los arreglos vacíos no se pueden mapear)
+def _abrir_npy(ruta):
+    try:
+        return np.load(ruta, mmap_mode='r')
+    except ValueError:
+        return np.load(ruta)
+
+class CacheEspectro:
+    def __init__(self, directorio=DIRECTORIO_CACHE, tamano_maximo=TAMANO_MAXIMO_CACHE):
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+
+    def _ruta_entrada(self, clave):
+        return os.path.join(self.directorio, clave)
+
+    # Devuelve (niveles, energias, transiciones); las transiciones vienen
+    # ordenadas por longitud de onda, listas para IndiceTransiciones(ya_ordenado=True).
+    # Con recortar=False no se desaloja nada: si varios procesos comparten el
+    # directorio, uno podría borrar la entrada que otro está por abrir, así que
+    # ahí recorta una sola vez quien los coordina, al terminar.
+    def cargar(self, archivo_csv, recortar=True):
+        clave = hash_archivo(archivo_csv)
+        ruta = self._ruta_entrada(clave)
+        if not all(os.path.exists(os.path.join(ruta, a)) for a in ARCHIVOS_ENTRADA):
+            self._construir(archivo_csv, ruta)
+            if recortar:
+                self.recortar(conservar=clave)
+        else:
+            os.utime(ruta)  # marca de uso para el desalojo LRU
+        return tuple(_abrir_npy(os.path.join(ruta, a)) for a in ARCHIVOS_ENTRADA)
+
+    # Parsear el CSV, calcular transiciones y guardarlas de forma atómica.
+    # Un nivel repetido en el CSV cuenta una vez, como en leer_niveles_energia
+    def _construir(self, archivo_csv, ruta):
+        niveles, energias = niveles_sin_repetir(*leer_niveles_arrays(archivo_csv))
+        transiciones = calcular_transiciones_arrays(energias, niveles)
+        orden = np.argsort(transiciones['longitud_onda_nm'], kind='stable')
+        transiciones = transiciones[orden]
+
+        os.makedirs(self.directorio, exist_ok=True)
+        temporal = tempfile.mkdtemp(dir=self.directorio, prefix='.tmp-')
+        try:
+            for nombre, datos in zip(ARCHIVOS_ENTRADA, (niveles, energias, transiciones)):
+                np.save(os.path.join(temporal, nombre), datos)
+            shutil.rmtree(ruta, ignore_errors=True)
+            os.replace(temporal, ruta)
+        except BaseException:
+            shutil.rmtree(temporal, ignore_errors=True)
+            raise
+
+    def _entradas(self):
+        if not os.path.isdir(self.directorio):
+            return []
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            ruta = self._ruta_entrada(nombre)
+            if nombre.startswith('.') or not os.path.isdir(ruta):
+                continue
+            tamano = sum(os.path.getsize(os.path.join(ruta, a))
+                         for a in os.listdir(ruta))
+            entradas.append((os.path.getmtime(ruta), tamano, nombre))
+        return entradas
+
+    # Desalojar las entradas usadas hace más tiempo hasta quedar bajo el límite
+    def recortar(self, conservar=None):
+        entradas = sorted(self._entradas())
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, nombre in entradas:
+            if total <= self.tamano_maximo:
+                break
+            if nombre == conservar:
+                continue
+            shutil.rmtree(self._ruta_entrada(nombre), ignore_errors=True)
+            total -= tamano
+
+    def limpiar(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
@@ -0,0 +1,69 @@
+from manim import DEFAULT_FONT_SIZE, WHITE, Text, VGroup
+
+# Etiquetas de texto armadas con glifos cacheados.
+# Text paga el shaping de Pango y la conversión a SVG en cada construcción;
+# en los bucles de las escenas eso se repite por iteración para textos que
+# solo cambian un número ("paso = 7", "Paso 8", "True"/"False").
+# Acá cada carácter se renderiza una sola vez por tamaño y fuente, y una
+# Etiqueta es solo copias de esos glifos puestas en fila, así que se usa igual
+# que Text (Write, FadeIn, ReplacementTransform, next_to, ...).
+
+# (carácter, font_size, fuente) -> (glifo, desplazamiento, avance)
+_glifos = {}
+
+# Renderizar un carácter entre dos "H": la primera fija la línea base y el
+# punto de partida, la segunda dice cuánto avanza el cursor (vale para espacios)
+def _glifo(caracter, font_size, fuente):
+    clave = (caracter, font_size, fuente)
+    if clave not in _glifos:
+        muestra = Text(f"H{caracter}H", font_size=font_size, font=fuente)
+        primera, segunda = muestra[0], muestra[-1]
+        origen = primera.get_corner([1, -1, 0])
+        glifo = VGroup(*muestra[1:-1])
+        desplazamiento = glifo.get_corner([-1, -1, 0]) - origen if len(glifo) else None
+        avance = segunda.get_left()[0] - origen[0]
+        _glifos[clave] = (glifo, desplazamiento, avance)
+    return _glifos[clave]
+
+class Etiqueta(VGroup):
+    def __init__(self, texto="", font_size=DEFAULT_FONT_SIZE, color=WHITE, font="", **kwargs):
+        super().__init__(**kwargs)
+        self.tamano_fuente = font_size
+        self.fuente = font
+        self.color_texto = color
+        self.texto = ""
+        self._armar(texto)
+        if len(self.submobjects):
+            self.center()
+
+    # Poner en fila copias de los glifos del texto
+    def _armar(self, texto):
+        self.texto = texto
+        glifos = []
+        cursor = 0.0
+        for caracter in texto:
+            glifo, desplazamiento, avance = _glifo(caracter, self.tamano_fuente, self.fuente)
+            if desplazamiento is not None:
+                copia = glifo.copy()
+                copia.shift([cursor, 0, 0] + desplazamiento - copia.get_corner([-1, -1, 0]))
+                glifos.extend(copia.submobjects)
+            cursor += avance
+        self.submobjects = []
+        self.add(*glifos)
+        self.set_color(self.color_texto)
+        return self
+
+    # Cambiar el texto en el lugar, manteniendo el centro
+    def set_texto(self, texto, color=None):
+        centro = self.get_center() if len(self.submobjects) else None
+        if color is not None:
+            self.color_texto = color
+        self._armar(texto)
+        if centro is not None and len(self.submobjects):
+            self.move_to(centro)
+        return self
+
+    # Etiqueta nueva con el mismo estilo, para ReplacementTransform(vieja, nueva)
+    def con_texto(self, texto, color=None):
+        return Etiqueta(texto, font_size=self.tamano_fuente,
+                        color=self.color_texto if color is None else color, font=self.fuente)
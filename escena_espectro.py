@@ -0,0 +1,165 @@
+from manim import *
+import numpy as np
+from escena_video import EscenaVideo
+from simulador_espectro import RANGO_VISIBLE, calcular_transiciones_arrays
+
+# Espectro de emisión del hidrógeno animado por series.
+# Las líneas no son un Line por transición: LineasEspectro agrupa todas las
+# transiciones en unos pocos VMobject (uno por serie y franja de color), cada
+# uno con todas sus líneas como subtrayectos de un solo arreglo de puntos.
+# Encender una serie es reescribir la coordenada y de esos arreglos con NumPy,
+# así que miles de líneas cuestan lo mismo que unas decenas de trazos.
+
+N_NIVELES = 80
+RANGO_NM = (80, 100_000)
+FRANJAS_COLOR = 32
+SERIES = {1: 'Lyman', 2: 'Balmer', 3: 'Paschen'}
+COLOR_UV = np.array([0.55, 0.50, 0.85])
+COLOR_IR = np.array([0.60, 0.18, 0.15])
+
+# Niveles del hidrógeno con la misma fórmula que crear_csv_hidrogeno
+def niveles_hidrogeno(n_max=N_NIVELES):
+    niveles = np.arange(1, n_max + 1)
+    return niveles, -13.6 / niveles ** 2
+
+# Color RGB (0-1) de cada longitud de onda; fuera del visible, colores fijos
+def colores_longitud_onda(nm):
+    nm = np.asarray(nm, dtype=np.float64)
+    tramos = [(380, 440, [1, 0, 1], [0, 0, 1]), (440, 490, [0, 0, 1], [0, 1, 1]),
+              (490, 510, [0, 1, 1], [0, 1, 0]), (510, 580, [0, 1, 0], [1, 1, 0]),
+              (580, 645, [1, 1, 0], [1, 0, 0]), (645, 751, [1, 0, 0], [1, 0, 0])]
+    rgb = np.empty(nm.shape + (3,))
+    rgb[nm < RANGO_VISIBLE[0]] = COLOR_UV
+    rgb[nm >= RANGO_VISIBLE[1]] = COLOR_IR
+    for a, b, desde, hasta in tramos:
+        en_tramo = (nm >= a) & (nm < b) & (nm < RANGO_VISIBLE[1])
+        t = ((nm[en_tramo] - a) / (b - a))[:, None]
+        rgb[en_tramo] = (1 - t) * np.array(desde) + t * np.array(hasta)
+    return rgb
+
+class LineasEspectro(VGroup):
+    def __init__(self, transiciones, izquierda, derecha, y_base, altura,
+                 ancho_trazo=1.5, franjas=FRANJAS_COLOR, **kwargs):
+        super().__init__(**kwargs)
+        self.izquierda, self.derecha = izquierda, derecha
+        self.y_base, self.altura = y_base, altura
+        longitudes = transiciones['longitud_onda_nm'].astype(np.float64)
+        en_rango = (longitudes >= RANGO_NM[0]) & (longitudes <= RANGO_NM[1])
+        longitudes = longitudes[en_rango]
+        series = transiciones['final'][en_rango]
+        x = self.x_longitud_onda(longitudes)
+
+        # Franja de color de cada línea (en escala logarítmica, como el eje)
+        log_rango = np.log10(RANGO_NM)
+        franja = np.clip(((np.log10(longitudes) - log_rango[0]) / (log_rango[1] - log_rango[0])
+                          * franjas).astype(np.int64), 0, franjas - 1)
+        centros = 10 ** (log_rango[0] + (np.arange(franjas) + 0.5) / franjas
+                         * (log_rango[1] - log_rango[0]))
+        colores = colores_longitud_onda(centros)
+        # Las líneas visibles usan su propio color en franjas más finas
+        visibles = (longitudes >= RANGO_VISIBLE[0]) & (longitudes < RANGO_VISIBLE[1])
+        franja[visibles] = franjas + np.round(longitudes[visibles] - RANGO_VISIBLE[0]).astype(np.int64)
+
+        # Un VMobject por (serie, franja); las series 4+ van juntas
+        serie_grupo = np.minimum(series, max(SERIES) + 1)
+        self.grupos = {}
+        claves = np.unique(np.stack([serie_grupo, franja], axis=1), axis=0)
+        for serie, f in claves:
+            filas = (serie_grupo == serie) & (franja == f)
+            color = (colores[f] if f < franjas
+                     else colores_longitud_onda(RANGO_VISIBLE[0] + f - franjas))
+            trazo = VMobject(stroke_width=ancho_trazo, stroke_color=ManimColor(color),
+                             fill_opacity=0)
+            trazo.set_points(self._puntos(x[filas], 0.0))
+            self.grupos.setdefault(int(serie), []).append(trazo)
+            self.add(trazo)
+        self.cantidad = int(len(longitudes))
+
+    def x_longitud_onda(self, nm):
+        log_rango = np.log10(RANGO_NM)
+        t = (np.log10(nm) - log_rango[0]) / (log_rango[1] - log_rango[0])
+        return self.izquierda + t * (self.derecha - self.izquierda)
+
+    # Cada línea es una curva cúbica recta (4 puntos) de y_base a y_base+alto
+    def _puntos(self, x, fraccion):
+        puntos = np.zeros((4 * len(x), 3))
+        puntos[:, 0] = np.repeat(x, 4)
+        puntos[:, 1] = self.y_base + np.tile([0, 1 / 3, 2 / 3, 1], len(x)) * self.altura * fraccion
+        return puntos
+
+    # Altura de todas las líneas de una serie (0 = apagadas, 1 = completas)
+    def encender(self, serie, fraccion):
+        patron = None
+        for trazo in self.grupos.get(serie, []):
+            if patron is None or len(patron) != len(trazo.points):
+                patron = np.tile([0, 1 / 3, 2 / 3, 1], len(trazo.points) // 4) * self.altura
+            trazo.points[:, 1] = self.y_base + patron * fraccion
+        return self
+
+    def series(self):
+        return sorted(self.grupos)
+
+class EspectroEmisionScene(EscenaVideo):
+    def construct(self):
+        title = Text("Espectro de emisión del hidrógeno", font_size=40, color=BLUE).to_edge(UP)
+        self.play(Write(title), run_time=1.5)
+
+        # Diagrama de niveles (n = 1..6) a la izquierda, con la energía en y
+        niveles, energias = niveles_hidrogeno()
+        transiciones = calcular_transiciones_arrays(energias, niveles)
+
+        def y_nivel(n):
+            return -3.0 + 5.0 * (1 - 1 / n ** 2)
+
+        diagrama = VGroup()
+        for n in range(1, 7):
+            linea = Line([-6.6, y_nivel(n), 0], [-3.4, y_nivel(n), 0], stroke_width=2, color=GRAY_B)
+            etiqueta = Text(f"n={n}", font_size=20).next_to(linea, LEFT, buff=0.15)
+            diagrama.add(VGroup(linea, etiqueta))
+        continuo = DashedLine([-6.6, y_nivel(np.inf), 0], [-3.4, y_nivel(np.inf), 0],
+                              stroke_width=1.5, color=GRAY)
+        self.play(FadeIn(diagrama), Create(continuo), run_time=1.2)
+
+        # Eje del espectro (logarítmico) con la banda visible marcada
+        izquierda, derecha, y_base, altura = -2.4, 6.6, -2.6, 3.6
+        lineas = LineasEspectro(transiciones, izquierda, derecha, y_base, altura)
+        eje = Line([izquierda, y_base, 0], [derecha, y_base, 0], stroke_width=2)
+        marcas = VGroup()
+        for nm, texto in ((100, "100"), (1000, "1000"), (10_000, "10⁴"), (100_000, "10⁵")):
+            x = lineas.x_longitud_onda(nm)
+            marcas.add(Line([x, y_base, 0], [x, y_base - 0.12, 0], stroke_width=2),
+                       Text(texto, font_size=18).move_to([x, y_base - 0.35, 0]))
+        x_vis = lineas.x_longitud_onda(np.array(RANGO_VISIBLE))
+        banda = Rectangle(width=x_vis[1] - x_vis[0], height=altura, stroke_width=0,
+                          fill_color=WHITE, fill_opacity=0.06)
+        banda.move_to([(x_vis[0] + x_vis[1]) / 2, y_base + altura / 2, 0])
+        unidad = Text("λ (nm)", font_size=20).next_to(eje, DOWN, buff=0.55)
+        self.play(Create(eje), FadeIn(marcas), FadeIn(banda), FadeIn(unidad), run_time=1.2)
+        self.add(lineas)
+        self.wait(0.5)
+
+        # Cada serie: electrones que caen al nivel final y sus líneas encendiéndose
+        for serie in lineas.series():
+            nombre = SERIES.get(serie, f"n ≥ {serie} (Brackett, Pfund, ...)")
+            rotulo = Text(nombre, font_size=30, color=YELLOW).next_to(title, DOWN)
+            flechas = VGroup(*[
+                Arrow([-5.9 + 0.45 * k, y_nivel(ni), 0], [-5.9 + 0.45 * k, y_nivel(serie), 0],
+                      buff=0, stroke_width=3, max_tip_length_to_length_ratio=0.15, color=YELLOW)
+                for k, ni in enumerate(range(serie + 1, min(serie + 6, 7)))
+            ])
+            progreso = ValueTracker(0)
+            lineas.add_updater(lambda m, serie=serie: m.encender(serie, progreso.get_value()))
+            self.play(FadeIn(rotulo), *[GrowArrow(f) for f in flechas],
+                      progreso.animate.set_value(1), run_time=2.5)
+            lineas.clear_updaters()
+            lineas.encender(serie, 1)
+            self.wait(1)
+            self.play(FadeOut(rotulo), FadeOut(flechas), run_time=0.6)
+
+        cuenta = Text(f"{lineas.cantidad} líneas, {N_NIVELES} niveles", font_size=24,
+                      color=GRAY_A).next_to(title, DOWN)
+        self.play(FadeIn(cuenta))
+        self.wait(3)
+        self.play(*[FadeOut(m) for m in (title, diagrama, continuo, eje, marcas, banda,
+                                         unidad, lineas, cuenta)])
+        self.wait(0.5)
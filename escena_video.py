@@ -0,0 +1,93 @@
+import numpy as np
+from manim import DEFAULT_WAIT_TIME, Camera, Scene, config
+from manim.constants import RendererType
+from manim.renderer.cairo_renderer import CairoRenderer
+from escritor_video import EscritorVideo, PoolCuadros
+from perfilador_escenas import perfilador_desde_entorno
+from preview_escenas import SEMILLA_ESCENAS, LineaTiempo, aplicar_config_preview, paso_preview
+
+# Renderizador de Cairo que copia cada cuadro a un buffer del PoolCuadros en
+# lugar de reservar un arreglo nuevo (get_frame); el codificador lo devuelve
+# al pool. La imagen estática de fondo sigue usando get_frame porque se guarda.
+class RenderizadorPipeline(CairoRenderer):
+    pool = None
+
+    def init_scene(self, scene, *args, **kwargs):
+        super().init_scene(scene, *args, **kwargs)
+        if hasattr(self.file_writer, 'pool_cuadros'):
+            pixeles = self.camera.pixel_array
+            self.pool = PoolCuadros(pixeles.shape, config.encoder_queue_size + 4, pixeles.dtype)
+            self.file_writer.pool_cuadros = self.pool
+
+    def _cuadro(self):
+        pixeles = self.camera.pixel_array
+        if self.pool is None or pixeles.shape != self.pool.forma:
+            return self.get_frame()
+        buffer = self.pool.tomar()
+        np.copyto(buffer, pixeles)
+        return buffer
+
+    def render(self, scene, time, moving_mobjects=None):
+        self.update_frame(scene, moving_mobjects)
+        self.add_frame(self._cuadro())
+
+    def freeze_current_frame(self, duration):
+        dt = 1 / self.camera.frame_rate
+        self.add_frame(self._cuadro(), num_frames=int(duration / dt))
+
+    def add_frame(self, frame, num_frames=1):
+        super().add_frame(frame, num_frames)
+        # Con animaciones salteadas el cuadro no llega al escritor
+        if self.skip_animations and self.pool is not None:
+            self.pool.liberar(frame)
+
+# Escena base de los videos: igual que Scene, pero con el renderizador de
+# Cairo conectado a EscritorVideo (pausas estáticas codificadas una sola vez,
+# cuadros en buffers reutilizables).
+# Con PERFIL_ESCENAS definida, el render se hace bajo el perfilador; con
+# PREVIEW_ESCENAS, en modo borrador (preview_escenas.py). La semilla aleatoria
+# es fija para que el preview y el render final coincidan.
+class EscenaVideo(Scene):
+    def __init__(self, renderer=None, **kwargs):
+        self.paso_preview = paso_preview()
+        self.linea_tiempo = None
+        if self.paso_preview:
+            aplicar_config_preview(self.paso_preview)
+            self.linea_tiempo = LineaTiempo(type(self))
+        kwargs.setdefault('random_seed', SEMILLA_ESCENAS)
+        if renderer is None and config.renderer == RendererType.CAIRO:
+            renderer = RenderizadorPipeline(
+                file_writer_class=EscritorVideo,
+                camera_class=kwargs.get('camera_class', Camera),
+                skip_animations=kwargs.get('skip_animations', False)
+            )
+        super().__init__(renderer=renderer, **kwargs)
+
+    def render(self, preview=False):
+        perfilador = perfilador_desde_entorno(self)
+        try:
+            if perfilador is None:
+                return super().render(preview)
+            with perfilador:
+                return super().render(preview)
+        finally:
+            if self.linea_tiempo is not None:
+                self.linea_tiempo.guardar()
+
+    def play(self, *args, **kwargs):
+        if self.linea_tiempo is None or self.linea_tiempo.ocupada:
+            return super().play(*args, **kwargs)
+        super().play(*args, **kwargs)
+        self.linea_tiempo.agregar('play', self.duration, self.duration)
+
+    # En preview la pausa dura un cuadro; en la línea de tiempo, lo pedido
+    def wait(self, duration=DEFAULT_WAIT_TIME, stop_condition=None, frozen_frame=None):
+        if self.linea_tiempo is None:
+            return super().wait(duration, stop_condition, frozen_frame)
+        un_cuadro = 1 / config.frame_rate
+        self.linea_tiempo.ocupada = True
+        try:
+            super().wait(min(duration, un_cuadro), stop_condition, frozen_frame)
+        finally:
+            self.linea_tiempo.ocupada = False
+        self.linea_tiempo.agregar('wait', duration, self.duration)
@@ -0,0 +1,159 @@
+import queue
+import threading
+import numpy as np
+from manim.scene.scene_file_writer import SceneFileWriter
+
+# Escritura de video para las escenas del proyecto.
+#
+# Pausas congeladas: cuando una escena hace self.wait() sin nada animándose,
+# manim ya dibuja el cuadro una sola vez, pero después lo manda al codificador
+# repetido (7 s a 60 fps son 420 cuadros idénticos convertidos a YUV y
+# comprimidos uno por uno). CodificadorPausas codifica solo el primer y el
+# último cuadro de la pausa y salta los timestamps del medio: el segmento dura
+# lo mismo, pero el costo ya no depende del largo de la pausa.
+#
+# Buffers reutilizables: manim ya codifica cada segmento en un hilo aparte con
+# una cola acotada, pero el renderizador copia el cuadro a un arreglo nuevo por
+# cada cuadro. Con PoolCuadros el renderizador copia sobre buffers ya
+# reservados, los pasa a la cola sin copiarlos y el codificador los devuelve
+# al pool cuando terminó de convertirlos (todos los segmentos, GIF incluido,
+# usan un codificador con el pool). Solo un cuadro que se consume en el mismo
+# write_frame (secuencia de imágenes, o fuera de un segmento) se libera al
+# volver. Si un segmento falla, el hilo de manim descarta los cuadros que
+# quedaban en su cola; esos se devuelven al pool cuando el hilo terminó.
+# Si el pool se vacía (el codificador va atrasado) el renderizador espera;
+# si la espera se vence se reserva un arreglo suelto, que no vuelve al pool.
+#
+# Requiere el codificador por segmentos de manim (VideoSegmentEncoder, v0.20+);
+# con versiones anteriores EscritorVideo es el SceneFileWriter normal.
+
+try:
+    from manim.scene.video_segment_encoder import VideoSegmentEncoder
+except ImportError:
+    VideoSegmentEncoder = None
+
+
+class PoolCuadros:
+    def __init__(self, forma, cantidad, dtype=np.uint8, espera=0.5):
+        self.forma = forma
+        self.dtype = dtype
+        self.espera = espera
+        self.asignaciones_extra = 0
+        self._buffers = [np.empty(forma, dtype=dtype) for _ in range(cantidad)]
+        self._en_uso = set()
+        self._candado = threading.Lock()
+        self._libres = queue.Queue()
+        for buffer in self._buffers:
+            self._libres.put(buffer)
+
+    def tomar(self):
+        try:
+            buffer = self._libres.get(timeout=self.espera)
+        except queue.Empty:
+            self.asignaciones_extra += 1
+            return np.empty(self.forma, dtype=self.dtype)
+        with self._candado:
+            self._en_uso.add(id(buffer))
+        return buffer
+
+    # Devolver un buffer tomado; los arreglos sueltos y las liberaciones
+    # repetidas se ignoran
+    def liberar(self, buffer):
+        with self._candado:
+            if id(buffer) not in self._en_uso:
+                return
+            self._en_uso.discard(id(buffer))
+        self._libres.put(buffer)
+
+
+if VideoSegmentEncoder is not None:
+
+    # Codificador de segmento que devuelve cada buffer al pool al terminar de
+    # convertirlo. en_cola guarda los cuadros encolados todavía sin convertir,
+    # para recuperarlos si el segmento falla y manim los descarta.
+    class CodificadorPool(VideoSegmentEncoder):
+        pool = None
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.en_cola = {}
+
+        def write_frame(self, pixels, *, repeat=1):
+            try:
+                self._codificar(pixels, repeat)
+            finally:
+                # El cuadro ya está convertido; el buffer se puede volver a usar
+                self.en_cola.pop(id(pixels), None)
+                if self.pool is not None:
+                    self.pool.liberar(pixels)
+
+        def _codificar(self, pixels, repeat):
+            return super().write_frame(pixels, repeat=repeat)
+
+    class CodificadorPausas(CodificadorPool):
+        def _codificar(self, pixels, repeat):
+            if repeat <= 2:
+                return super()._codificar(pixels, repeat)
+            # Primer cuadro de la pausa, salto de timestamps y último cuadro
+            super()._codificar(pixels, 1)
+            self._next_pts += repeat - 2
+            super()._codificar(pixels, 1)
+
+    class EscritorVideo(SceneFileWriter):
+        pool_cuadros = None
+
+        def _create_segment_encoder(self, target):
+            if self.video_encoder is None:
+                return super()._create_segment_encoder(target)
+            # Los GIF se rearman cuadro por cuadro y perderían la duración de
+            # la pausa: sin compresión de pausas, pero con el pool igual
+            clase = CodificadorPool if self.output_spec.is_gif else CodificadorPausas
+            codificador = clase(target=target, spec=self.video_encoder)
+            codificador.pool = self.pool_cuadros
+            return codificador
+
+        def write_frame(self, pixels, *, repeat=1):
+            # Con un segmento abierto el cuadro va a la cola del codificador,
+            # que lo libera en su hilo (aunque super() vuelva enseguida). Si
+            # se consume acá mismo (imágenes, fuera de un segmento), se libera
+            # al volver.
+            trabajo = self._current_encode_job
+            encolado = (self.output_spec.is_video and trabajo is not None
+                        and isinstance(trabajo.encoder, CodificadorPool))
+            if encolado:
+                trabajo.encoder.en_cola[id(pixels)] = pixels
+            try:
+                super().write_frame(pixels, repeat=repeat)
+            finally:
+                # Segmento fallido: super() ya esperó al hilo, que descartó la cola
+                if encolado:
+                    self._recuperar(trabajo)
+            if not encolado and self.pool_cuadros is not None:
+                self.pool_cuadros.liberar(pixels)
+
+        # Devolver al pool los cuadros que un segmento terminado no llegó a
+        # convertir (el hilo de manim los saltea después de un error)
+        def _recuperar(self, trabajo):
+            en_cola = getattr(trabajo.encoder, 'en_cola', None)
+            if not en_cola or trabajo.thread.is_alive() or self.pool_cuadros is None:
+                return
+            for buffer in list(en_cola.values()):
+                self.pool_cuadros.liberar(buffer)
+            en_cola.clear()
+
+        def _join_job(self, job):
+            try:
+                super()._join_job(job)
+            finally:
+                self._recuperar(job)
+
+        def abort_encode_jobs(self, reraise_encoder_failures=False):
+            trabajo = self._current_encode_job
+            try:
+                super().abort_encode_jobs(reraise_encoder_failures)
+            finally:
+                if trabajo is not None:
+                    self._recuperar(trabajo)
+
+else:
+    EscritorVideo = SceneFileWriter
@@ -0,0 +1,240 @@
+import numpy as np
+from simulador_espectro import IndiceTransiciones, transiciones_a_arreglo
+
+# Espectro continuo: cada transición se ensancha con un perfil gaussiano,
+# lorentziano o de Voigt y se suma sobre una rejilla de longitudes de onda.
+# Los perfiles están normalizados en área, así que la intensidad de cada
+# línea es su flujo integrado (por defecto, su energía en eV, igual que la
+# altura de las líneas en generar_espectro).
+#
+# Dos métodos:
+#  - 'directo': cada perfil se evalúa solo en una ventana local alrededor de
+#    su centro (±truncar·FWHM para la parte lorentziana, ±3 FWHM para la
+#    gaussiana), por lotes de líneas, y se acumula con np.bincount. Admite
+#    rejillas no uniformes.
+#  - 'fft': con rejilla uniforme, las líneas se depositan como deltas en la
+#    rejilla y se convolucionan con el perfil por FFT, una vez por nodo de
+#    cada clase de ancho (ver _espectro_fft). El costo casi no depende del
+#    número de líneas ni del ancho.
+
+PERFILES = ('gaussiano', 'lorentziano', 'voigt')
+ELEMENTOS_POR_LOTE = 4_000_000  # puntos evaluados a la vez en el método directo
+TRUNCAR_GAUSSIANO = 3.0  # semiancho de la ventana gaussiana, en FWHM
+RAZON_CLASE = 1.2  # anchos de una clase del método FFT: [a, 1.2·a]
+NODOS_CLASE = 5  # núcleos por clase; interpolar entre ellos erra < 1e-6 del pico
+
+# Rejilla uniforme de longitudes de onda (nm)
+def rejilla_longitudes(lmin=380, lmax=750, puntos=10_000):
+    return np.linspace(lmin, lmax, puntos)
+
+def _gaussiano(x, fwhm):
+    sigma = fwhm / (2 * np.sqrt(2 * np.log(2)))
+    return np.exp(-0.5 * (x / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+
+def _lorentziano(x, fwhm):
+    gamma = fwhm / 2
+    return gamma / (np.pi * (x ** 2 + gamma ** 2))
+
+# Parámetros del pseudo-Voigt (Thompson, Cox y Hastings): FWHM común f y
+# fracción lorentziana eta. El perfil es eta·L(f) + (1 - eta)·G(f), preciso
+# al ~1% y sin depender de scipy
+def _parametros_voigt(fwhm_g, fwhm_l):
+    f = (fwhm_g ** 5 + 2.69269 * fwhm_g ** 4 * fwhm_l + 2.42843 * fwhm_g ** 3 * fwhm_l ** 2
+         + 4.47163 * fwhm_g ** 2 * fwhm_l ** 3 + 0.07842 * fwhm_g * fwhm_l ** 4
+         + fwhm_l ** 5) ** 0.2
+    r = fwhm_l / f
+    eta = 1.36603 * r - 0.47719 * r ** 2 + 0.11116 * r ** 3
+    return f, eta
+
+# Un perfil como suma de componentes (función, FWHM, peso, semiancho en FWHM).
+# Solo la parte lorentziana, de cola larga, necesita ±truncar·FWHM; la
+# gaussiana se corta a ±TRUNCAR_GAUSSIANO·FWHM, donde ya vale ~1e-11 del pico
+def _componentes(perfil, ancho, ancho_lorentz, truncar):
+    corte_gaussiano = min(truncar, TRUNCAR_GAUSSIANO)
+    if perfil == 'gaussiano':
+        return [(_gaussiano, ancho, 1.0, corte_gaussiano)]
+    if perfil == 'lorentziano':
+        return [(_lorentziano, ancho, 1.0, truncar)]
+    f, eta = _parametros_voigt(ancho, ancho_lorentz)
+    return [(_lorentziano, f, eta, truncar), (_gaussiano, f, 1 - eta, corte_gaussiano)]
+
+def _es_uniforme(rejilla):
+    pasos = np.diff(rejilla)
+    return len(pasos) > 0 and np.allclose(pasos, pasos[0], rtol=1e-6, atol=0)
+
+# Clases de ancho para el método FFT: [(índices, nodos)] con anchos dentro de
+# [a, RAZON_CLASE·a]. Una clase de ancho único tiene un solo nodo (exacta);
+# las demás, NODOS_CLASE nodos de Chebyshev entre su mínimo y su máximo.
+def _clases_de_ancho(anchos):
+    if len(anchos) == 0:
+        return []
+    clase = np.floor(np.log(anchos / anchos.min()) / np.log(RAZON_CLASE)).astype(np.int64)
+    orden = np.argsort(clase, kind='stable')
+    cortes = np.flatnonzero(np.diff(clase[orden])) + 1
+    clases = []
+    for indices in np.split(orden, cortes):
+        a, b = anchos[indices].min(), anchos[indices].max()
+        if a == b:
+            nodos = np.array([a])
+        else:
+            k = np.arange(NODOS_CLASE)
+            nodos = (a + b) / 2 + (b - a) / 2 * np.cos((2 * k + 1) * np.pi / (2 * NODOS_CLASE))
+        clases.append((indices, nodos))
+    return clases
+
+# Pesos de Lagrange de cada ancho respecto de los nodos: (nodos, líneas)
+def _pesos_lagrange(anchos, nodos):
+    pesos = np.ones((len(nodos), len(anchos)))
+    for j in range(len(nodos)):
+        for k in range(len(nodos)):
+            if k != j:
+                pesos[j] *= (anchos - nodos[k]) / (nodos[j] - nodos[k])
+    return pesos
+
+# Método directo: ventanas locales por lotes de líneas, componente por componente
+def _espectro_directo(centros, intensidades, rejilla, componentes):
+    espectro = np.zeros(len(rejilla))
+    for funcion, fwhm, peso, corte in componentes:
+        pesos = np.broadcast_to(intensidades * peso, centros.shape)
+        usadas = np.flatnonzero(pesos)
+        fwhm = np.broadcast_to(fwhm, centros.shape)[usadas]
+        _acumular_ventanas(espectro, centros[usadas], pesos[usadas], rejilla, funcion, fwhm, corte)
+    return espectro
+
+def _acumular_ventanas(espectro, centros, intensidades, rejilla, funcion, fwhm, corte):
+    semiancho = corte * fwhm
+    inicio = np.searchsorted(rejilla, centros - semiancho, side='left')
+    fin = np.searchsorted(rejilla, centros + semiancho, side='right')
+    largo = fin - inicio
+
+    # Lotes ordenados por largo de ventana para no rellenar de más
+    orden = np.argsort(largo, kind='stable')
+    largo_ordenado = np.maximum(largo[orden], 1)
+    i = 0
+    while i < len(orden):
+        # El lote más largo que cabe en ELEMENTOS_POR_LOTE (las ventanas crecen con i)
+        j = min(len(orden), i + max(1, ELEMENTOS_POR_LOTE // int(largo_ordenado[i])))
+        j = min(j, i + max(1, ELEMENTOS_POR_LOTE // int(largo_ordenado[j - 1])))
+        lote = orden[i:j]
+        k = int(largo_ordenado[j - 1])
+
+        indices = inicio[lote, None] + np.arange(k)
+        validos = indices < fin[lote, None]
+        indices = np.minimum(indices, len(rejilla) - 1)
+        x = rejilla[indices] - centros[lote, None]
+        valores = funcion(x, fwhm[lote, None])
+        valores *= intensidades[lote, None]
+        espectro += np.bincount(indices[validos], weights=valores[validos],
+                                minlength=len(rejilla))
+        i = j
+
+# Método FFT: deltas depositadas en la rejilla y convolucionadas con un núcleo
+# por nodo de cada clase de ancho. Dentro de una clase el perfil de cada
+# línea se interpola en el ancho (Lagrange) entre los núcleos de sus nodos,
+# así que anchos por línea cuestan unas pocas FFT y no una ventana por línea.
+# La ventana de una clase es la de su línea más ancha: con anchos distintos
+# la cola lorentziana se corta algo más lejos que en el método directo.
+# La rejilla se extiende el semiancho del núcleo a cada lado: las líneas con
+# el centro fuera de ella también suman sus colas, como en el método directo.
+def _espectro_fft(centros, intensidades, rejilla, componentes):
+    n = len(rejilla)
+    paso = rejilla[1] - rejilla[0]
+    espectro = np.zeros(n)
+    for funcion, fwhm, peso, corte in componentes:
+        pesos = np.broadcast_to(intensidades * peso, centros.shape)
+        usadas = np.flatnonzero(pesos)
+        anchos = np.broadcast_to(fwhm, centros.shape)[usadas]
+        for indices, nodos in _clases_de_ancho(anchos):
+            # La ventana de la clase cubre la de su línea más ancha
+            semiancho = corte * anchos[indices].max()
+            h = int(np.ceil(semiancho / paso))
+            extendida = n + 2 * h
+
+            # Depositar cada línea entre sus dos puntos vecinos (interpolación lineal)
+            lineas = usadas[indices]
+            posicion = (centros[lineas] - rejilla[0]) / paso + h
+            dentro = (posicion > -1) & (posicion < extendida)
+            if not dentro.any():
+                continue
+            posicion, lineas = posicion[dentro], lineas[dentro]
+            izquierda = np.floor(posicion).astype(np.int64)
+            fraccion = posicion - izquierda
+            coeficientes = pesos[lineas] * _pesos_lagrange(anchos[indices][dentro], nodos)
+
+            desplazamientos = np.arange(-h, h + 1) * paso
+            fuera = np.abs(desplazamientos) > semiancho
+            largo = 1 << int(np.ceil(np.log2(extendida + 2 * h)))
+            producto = 0
+            for nodo, coeficiente in zip(nodos, coeficientes):
+                # deltas[t + 1] es el punto t de la rejilla extendida (izquierda = -1 cae en deltas[0])
+                deltas = (np.bincount(izquierda + 1, weights=coeficiente * (1 - fraccion),
+                                      minlength=extendida + 2)
+                          + np.bincount(izquierda + 2, weights=coeficiente * fraccion,
+                                        minlength=extendida + 2))[1:extendida + 1]
+                nucleo = funcion(desplazamientos, nodo)
+                nucleo[fuera] = 0
+                producto = producto + np.fft.rfft(deltas, largo) * np.fft.rfft(nucleo, largo)
+            espectro += np.fft.irfft(producto, largo)[2 * h:2 * h + n]
+    return espectro
+
+# Costo relativo de los dos métodos sobre una rejilla uniforme
+def _costos(centros, rejilla, componentes):
+    paso = rejilla[1] - rejilla[0]
+    costo_directo = costo_fft = 0
+    for _, fwhm, _, corte in componentes:
+        anchos = np.broadcast_to(fwhm, centros.shape)
+        costo_directo += 2 * corte * anchos.sum() / paso
+        for indices, nodos in _clases_de_ancho(anchos):
+            largo = len(rejilla) + 4 * corte * anchos[indices].max() / paso
+            costo_fft += len(nodos) * largo * np.log2(max(largo, 2))
+    return costo_directo, costo_fft
+
+# Espectro continuo de un conjunto de transiciones sobre `rejilla`.
+# ancho: FWHM (nm) gaussiano/lorentziano, o la parte gaussiana del Voigt;
+# puede ser un escalar o un arreglo con un valor por transición.
+# ancho_lorentz: FWHM lorentziano del Voigt (por defecto, igual a ancho).
+# truncar: semiancho de la ventana de la parte lorentziana, en FWHM.
+def espectro_continuo(transiciones, rejilla, perfil='gaussiano', ancho=0.5, ancho_lorentz=None,
+                      intensidades=None, truncar=10.0, metodo='auto'):
+    if perfil not in PERFILES:
+        raise ValueError(f"Perfil desconocido: {perfil} (use uno de {PERFILES})")
+    if isinstance(transiciones, IndiceTransiciones):
+        transiciones = transiciones.transiciones
+    transiciones = transiciones_a_arreglo(transiciones)
+    rejilla = np.asarray(rejilla, dtype=np.float64)
+
+    centros = np.asarray(transiciones['longitud_onda_nm'], dtype=np.float64)
+    if intensidades is None:
+        intensidades = transiciones['energia_eV']
+    intensidades = np.asarray(intensidades, dtype=np.float64)
+    if ancho_lorentz is None:
+        ancho_lorentz = ancho
+
+    # Descartar líneas con longitud de onda no finita (niveles degenerados)
+    finitas = np.isfinite(centros)
+    centros, intensidades = centros[finitas], intensidades[finitas]
+    ancho = np.asarray(ancho, dtype=np.float64)
+    ancho_lorentz = np.asarray(ancho_lorentz, dtype=np.float64)
+    if ancho.ndim:
+        ancho = ancho[finitas]
+    if ancho_lorentz.ndim:
+        ancho_lorentz = ancho_lorentz[finitas]
+    if np.any(ancho <= 0) or np.any(ancho_lorentz <= 0):
+        raise ValueError("Los anchos de línea tienen que ser positivos")
+
+    componentes = _componentes(perfil, ancho, ancho_lorentz, truncar)
+    if metodo == 'auto':
+        # FFT cuando se puede y evaluar ventanas locales costaría más
+        metodo = 'directo'
+        if _es_uniforme(rejilla):
+            costo_directo, costo_fft = _costos(centros, rejilla, componentes)
+            if costo_fft < costo_directo:
+                metodo = 'fft'
+
+    if metodo == 'fft':
+        if not _es_uniforme(rejilla):
+            raise ValueError("El método 'fft' requiere una rejilla uniforme")
+        return _espectro_fft(centros, intensidades, rejilla, componentes)
+    if metodo == 'directo':
+        return _espectro_directo(centros, intensidades, rejilla, componentes)
+    raise ValueError(f"Método desconocido: {metodo}")
@@ -1,8 +1,7 @@
 import numpy as np
-import matplotlib.pyplot as plt
 import csv
-from matplotlib.collections import LineCollection
 import os
+from simulador_espectro import calcular_transiciones_arrays, transiciones_a_dicts
 
 # Leer niveles de energía desde CSV
 def leer_niveles_energia(archivo_csv):
@@ -15,24 +14,18 @@ def leer_niveles_energia(archivo_csv):
             niveles[nivel] = energia
     return niveles
 
-# Calcular todas las transiciones posibles
+# Calcular todas las transiciones posibles (motor vectorizado compartido)
 def calcular_transiciones(niveles):
-    transiciones = []
-    for ni in niveles:
-        for nf in niveles:
-            if ni > nf:  # Solo transiciones a niveles inferiores
-                delta_e = abs(niveles[nf] - niveles[ni])
-                longitud_onda = 1240 / delta_e  # en nm (E = hc/λ)
-                transiciones.append({
-                    'inicial': ni,
-                    'final': nf,
-                    'energia_eV': round(delta_e, 2),
-                    'longitud_onda_nm': round(longitud_onda, 1)
-                })
-    return transiciones
+    energias = np.fromiter(niveles.values(), dtype=np.float64, count=len(niveles))
+    numeros = np.fromiter(niveles.keys(), dtype=np.int64, count=len(niveles))
+    return transiciones_a_dicts(calcular_transiciones_arrays(energias, numeros))
 
 # Generar espectro de líneas
 def generar_espectro(transiciones, archivo_salida):
+    # matplotlib se carga solo al graficar
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
     # Filtrar solo el rango visible
     visibles = [t for t in transiciones if 380 < t['longitud_onda_nm'] < 750]
     
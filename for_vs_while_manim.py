@@ -1,30 +1,36 @@
 from manim import *
 import numpy as np
+from escena_video import EscenaVideo
+from cache_assets import codigo_cacheado, imagen_cacheada, svg_cacheado
+from contador import Etiqueta
+from animacion_bucle import AnimacionBucle
+from traza_bucle import traza_cacheada
 
 config.assets_dir = "assets"
 
-class Robot(SVGMobject):
+# El SVG se parsea una sola vez (cache_assets); cada Robot es una copia
+class Robot(VGroup):
     def __init__(self, **kwargs):
-        super().__init__("robot.svg", **kwargs)
+        super().__init__(*svg_cacheado("robot.svg").submobjects, **kwargs)
         self.set(width=1.2)
         self.set_fill(WHITE)
         self.set_stroke(BLACK, width=2)
 
 # 1. INTRO
-class IntroScene(Scene):
+class IntroScene(EscenaVideo):
     def construct(self):
         self.wait(0.5)
         title = Text("¿FOR o WHILE? ¡La Gran Duda!", font_size=54, color=BLUE)
         self.play(Write(title), run_time=2.5)
         self.wait(2)
-        meme = ImageMobject("meme_intro.png").scale(1.3).next_to(title, DOWN)
+        meme = imagen_cacheada("meme_intro.png", escala=1.3).next_to(title, DOWN)
         self.play(FadeIn(meme), run_time=1.5)
         self.wait(7)
         self.play(FadeOut(title), FadeOut(meme))
         self.wait(1)
 
 # 2. FOR
-class ForScene(Scene):
+class ForScene(EscenaVideo):
     def construct(self):
         self.wait(1)
         title = Text("FOR: Pasos Exactos", font_size=44).to_edge(UP)
@@ -54,13 +60,13 @@ class ForScene(Scene):
                 run_time=1.3
             )   
              # 2. Luego muestra el número en la nueva posición
-            step_text = Text(f"{i+1}", font_size=32).next_to(robot, UP)
+            step_text = Etiqueta(f"{i+1}", font_size=32).next_to(robot, UP)
             self.play(Write(step_text))
             self.wait(1.1)
             self.remove(step_text)
 
         self.wait(2)
-        code = Code(
+        code = codigo_cacheado(
             "for_loop.py",
             tab_width=4,
             background="window",
@@ -69,14 +75,14 @@ class ForScene(Scene):
         self.play(FadeIn(code), run_time=1.2)
         self.wait(8)  # Tiempo largo para leer el código
 
-        meme = ImageMobject("meme_for.png").scale(1.12).to_corner(DOWN+RIGHT)
+        meme = imagen_cacheada("meme_for.png", escala=1.12).to_corner(DOWN+RIGHT)
         self.play(FadeIn(meme), run_time=1.5)
         self.wait(7)
         self.play(FadeOut(code), FadeOut(meme), FadeOut(robot), FadeOut(target), *[FadeOut(h) for h in pasos], FadeOut(title))
         self.wait(1.5)
 
 # 3. WHILE
-class WhileScene(Scene):
+class WhileScene(EscenaVideo):
     def construct(self):
         self.wait(1)
         title = Text("WHILE: Hasta Alcanzar", font_size=44).to_edge(UP)
@@ -95,7 +101,7 @@ class WhileScene(Scene):
             pos = robot.get_center() + RIGHT * 0.8
             huella = Dot(pos, radius=0.13, color=GRAY)
             pasos.append(huella)
-            step_text = Text(f"{steps+1}", font_size=32).next_to(robot, UP)
+            step_text = Etiqueta(f"{steps+1}", font_size=32).next_to(robot, UP)
             self.play(
                 robot.animate.move_to(pos),
                 FadeIn(huella),
@@ -107,7 +113,7 @@ class WhileScene(Scene):
             steps += 1
 
         self.wait(2)
-        code = Code(
+        code = codigo_cacheado(
             "while_loop.py",
             tab_width=4,
             background="window",
@@ -115,14 +121,14 @@ class WhileScene(Scene):
         ).to_corner(DOWN+LEFT)
         self.play(FadeIn(code), run_time=1.2)
         self.wait(8)
-        meme = ImageMobject("meme_while.png").scale(1.12).to_corner(DOWN+RIGHT)
+        meme = imagen_cacheada("meme_while.png", escala=1.12).to_corner(DOWN+RIGHT)
         self.play(FadeIn(meme), run_time=1.5)
         self.wait(7)
         self.play(FadeOut(code), FadeOut(meme), FadeOut(robot), FadeOut(target), *[FadeOut(h) for h in pasos], FadeOut(title))
         self.wait(1.5)
 
 # 4. COMPARACION
-class ComparacionScene(Scene):
+class ComparacionScene(EscenaVideo):
     def construct(self):
         self.wait(1)
         title = Text("FOR vs WHILE", font_size=48, color=GREEN).to_edge(UP)
@@ -151,14 +157,14 @@ class ComparacionScene(Scene):
             self.wait(0.5)
 
         self.wait(3)
-        meme = ImageMobject("meme_comparacion.png").scale(1.15).to_corner(DOWN)
+        meme = imagen_cacheada("meme_comparacion.png", escala=1.15).to_corner(DOWN)
         self.play(FadeIn(meme), run_time=1.5)
         self.wait(8)
         self.play(*[FadeOut(m) for m in [title, left_rect, right_rect, robot_for, target_for, robot_while, target_while, meme]])
         self.wait(1.7)
 
 # 5. CONCLUSION
-class ConclusionScene(Scene):
+class ConclusionScene(EscenaVideo):
     def construct(self):
         self.wait(1)
         title = Text("¡Recuerda la Diferencia!", font_size=44, color=PURPLE)
@@ -177,7 +183,7 @@ class ConclusionScene(Scene):
 
 
 
-class ForDemo(Scene):
+class ForDemo(EscenaVideo):
     def construct(self):
         # Título
         title = Text("FOR: Avanza 5 pasos", font_size=40, color=BLUE).to_edge(UP)
@@ -185,7 +191,7 @@ class ForDemo(Scene):
         self.wait(0.5)
 
         # Código fuente
-        code = Code(
+        code = codigo_cacheado(
             "for_loop.py",
             tab_width=4,
             background="window",
@@ -195,7 +201,7 @@ class ForDemo(Scene):
         self.wait(0.5)
 
         # Variables visuales
-        var_text = Text("paso = 0", font_size=34, color=YELLOW).to_corner(UP+RIGHT)
+        var_text = Etiqueta("paso = 0", font_size=34, color=YELLOW).to_corner(UP+RIGHT)
         self.play(FadeIn(var_text))
         self.wait(0.4)
 
@@ -206,13 +212,13 @@ class ForDemo(Scene):
         # Ciclo for didáctico
         for i in range(5):
             # Actualiza variable
-            new_var = Text(f"paso = {i}", font_size=34, color=YELLOW).to_corner(UP+RIGHT)
+            new_var = var_text.con_texto(f"paso = {i}").to_corner(UP+RIGHT)
             self.play(ReplacementTransform(var_text, new_var), run_time=0.18)
             var_text = new_var
             self.wait(0.15)
 
             # Simula print en consola
-            print_line = Text(f"Paso {i+1}", font_size=30, color=GREEN)
+            print_line = Etiqueta(f"Paso {i+1}", font_size=30, color=GREEN)
             print_line.move_to(print_base + DOWN * 0.43 * i)
             self.play(Write(print_line), run_time=0.20)
             print_area.add(print_line)
@@ -232,7 +238,7 @@ class ForDemo(Scene):
         )
         self.wait(0.3)
 
-class WhileDemo(Scene):
+class WhileDemo(EscenaVideo):
     def construct(self):
         # Título
         title = Text("WHILE: Hasta llegar al objetivo", font_size=40, color=BLUE).to_edge(UP)
@@ -240,7 +246,7 @@ class WhileDemo(Scene):
         self.wait(0.5)
 
         # Código fuente
-        code = Code(
+        code = codigo_cacheado(
             "while_loop.py",
             tab_width=4,
             background="window",
@@ -249,56 +255,14 @@ class WhileDemo(Scene):
         self.play(FadeIn(code), run_time=1)
         self.wait(0.5)
 
-        # Variables iniciales
-        objetivo = 12
-        paso = 0
-
-        paso_text = Text(f"paso = {paso}", font_size=34, color=YELLOW).to_corner(UP+RIGHT)
-        objetivo_text = Text(f"objetivo = {objetivo}", font_size=34, color=WHITE).next_to(paso_text, DOWN, aligned_edge=RIGHT)
-        self.play(FadeIn(paso_text), FadeIn(objetivo_text))
-        self.wait(0.3)
-
-        cond_color = GREEN if paso < objetivo else RED
-        cond_text = Text(f"paso < objetivo → {paso < objetivo}", font_size=28, color=cond_color)
-        cond_text.next_to(objetivo_text, DOWN, aligned_edge=RIGHT)
-        self.play(FadeIn(cond_text))
-        self.wait(0.3)
-
-        print_area = VGroup()
+        # Variables, condición y consola salen de ejecutar while_loop.py
+        # (traza cacheada); los bucles largos se resumen en saltos
         print_base = code.get_right() + RIGHT * 1.2 + UP * 1.3
-
-        idx_print = 0
-        while paso < objetivo:
-            paso += 1
-            new_paso_text = Text(f"paso = {paso}", font_size=34, color=YELLOW).to_corner(UP+RIGHT)
-            self.play(ReplacementTransform(paso_text, new_paso_text), run_time=0.13)
-            paso_text = new_paso_text
-
-            # Actualiza condición booleana
-            cond_color = GREEN if paso < objetivo else RED
-            new_cond_text = Text(f"paso < objetivo → {paso < objetivo}", font_size=28, color=cond_color)
-            new_cond_text.next_to(objetivo_text, DOWN, aligned_edge=RIGHT)
-            self.play(ReplacementTransform(cond_text, new_cond_text), run_time=0.12)
-            cond_text = new_cond_text
-
-            # Simula print en consola
-            print_line = Text(f"Paso {paso}", font_size=30, color=GREEN)
-            print_line.move_to(print_base + DOWN * 0.39 * idx_print)
-            self.play(Write(print_line), run_time=0.15)
-            print_area.add(print_line)
-            self.wait(0.09)
-            idx_print += 1
-
-        # Print final
-        print_final = Text("¡Objetivo detectado!", font_size=30, color=ORANGE)
-        print_final.move_to(print_base + DOWN * 0.39 * idx_print + DOWN * 0.18)
-        self.play(Write(print_final), run_time=0.22)
-        print_area.add(print_final)
+        bucle = AnimacionBucle(self, traza_cacheada("while_loop.py"), print_base).animar()
         self.wait(1.8)
 
         self.play(
             FadeOut(title), FadeOut(code),
-            FadeOut(paso_text), FadeOut(objetivo_text), FadeOut(cond_text),
-            *[FadeOut(linea) for linea in print_area]
+            *[FadeOut(m) for m in bucle.mobjects()]
         )
-        self.wait(0.3)
\ No newline at end of file
+        self.wait(0.3)
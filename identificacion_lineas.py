@@ -0,0 +1,233 @@
+import argparse
+import numpy as np
+from simulador_espectro import (DTYPE_TRANSICION, IndiceTransiciones, leer_transiciones_binario)
+
+# Identificación de picos observados con las transiciones calculadas.
+# Sobre el índice ordenado por longitud de onda, los candidatos de todos los
+# picos salen de dos searchsorted (bordes de cada ventana λ ± tolerancia) y
+# se devuelven en formato CSR: punteros[i]:punteros[i+1] son los del pico i.
+#
+# Barrido de corrimiento (z o desplazamiento en nm): en vez de reidentificar
+# todos los picos para cada valor de prueba, cada par (pico, transición) que
+# puede coincidir en algún punto del barrido aporta el intervalo de valores en
+# que coincide. Los intervalos de un mismo pico se unen (cuenta una vez) y se
+# suman sobre la rejilla con un arreglo de diferencias: el costo es
+# O(pares + rejilla) en lugar de O(rejilla · picos · log N).
+
+MODOS_CORRIMIENTO = ('z', 'nm')
+
+# Leer transiciones guardadas por guardar_transiciones (csv, csv.gz, npy, npz o bin)
+def cargar_transiciones(archivo):
+    nombre = str(archivo).lower()
+    if nombre.endswith('.npy'):
+        return np.load(archivo).astype(DTYPE_TRANSICION, copy=False)
+    if nombre.endswith('.npz'):
+        with np.load(archivo) as datos:
+            transiciones = np.empty(len(datos[DTYPE_TRANSICION.names[0]]), dtype=DTYPE_TRANSICION)
+            for campo in DTYPE_TRANSICION.names:
+                transiciones[campo] = datos[campo]
+        return transiciones
+    if nombre.endswith('.bin'):
+        return leer_transiciones_binario(archivo)
+    return np.atleast_1d(np.loadtxt(archivo, delimiter=',', skiprows=1, dtype=DTYPE_TRANSICION))
+
+# Candidatos de una tanda de picos, en formato CSR
+class Candidatos:
+    def __init__(self, punteros, transiciones, residuos):
+        self.punteros = punteros
+        self.transiciones = transiciones
+        self.residuos = residuos  # λ modelo − λ observada, en nm
+
+    def __len__(self):
+        return len(self.punteros) - 1
+
+    def cantidades(self):
+        return np.diff(self.punteros)
+
+    # Candidatos (transiciones, residuos) del pico i
+    def __getitem__(self, i):
+        tramo = slice(self.punteros[i], self.punteros[i + 1])
+        return self.transiciones[tramo], self.residuos[tramo]
+
+    # Posición (en .transiciones) del candidato más cercano de cada pico, o -1
+    def mejores(self):
+        cantidades = self.cantidades()
+        picos = np.repeat(np.arange(len(self)), cantidades)
+        orden = np.lexsort((np.abs(self.residuos), picos))
+        mejores = np.full(len(self), -1, dtype=np.int64)
+        con_candidatos = cantidades > 0
+        mejores[con_candidatos] = orden[self.punteros[:-1][con_candidatos]]
+        return mejores
+
+class IdentificadorLineas:
+    def __init__(self, transiciones, ya_ordenado=False):
+        if isinstance(transiciones, IndiceTransiciones):
+            self.indice = transiciones
+        else:
+            self.indice = IndiceTransiciones(transiciones, ya_ordenado=ya_ordenado)
+
+    @property
+    def longitudes(self):
+        return self.indice.longitudes
+
+    # Bordes [inicio, fin) en el índice de los λ de reposo que caen en cada ventana
+    def _bordes(self, minimos, maximos):
+        inicio = np.searchsorted(self.longitudes, minimos, side='left')
+        fin = np.searchsorted(self.longitudes, maximos, side='right')
+        return inicio, np.maximum(fin, inicio)
+
+    # Índices planos (CSR) de los rangos [inicio, fin)
+    @staticmethod
+    def _expandir(inicio, fin):
+        cantidades = fin - inicio
+        punteros = np.zeros(len(inicio) + 1, dtype=np.int64)
+        np.cumsum(cantidades, out=punteros[1:])
+        indices = np.repeat(inicio - punteros[:-1], cantidades) + np.arange(punteros[-1])
+        return punteros, indices
+
+    # Candidatos de cada pico: |λ·(1+z) + desplazamiento − λobs| ≤ tolerancia
+    def candidatos(self, observadas, tolerancias, z=0.0, desplazamiento=0.0):
+        observadas = np.asarray(observadas, dtype=np.float64)
+        tolerancias = np.broadcast_to(np.asarray(tolerancias, dtype=np.float64), observadas.shape)
+        factor = 1 + z
+        inicio, fin = self._bordes((observadas - tolerancias - desplazamiento) / factor,
+                                   (observadas + tolerancias - desplazamiento) / factor)
+        punteros, indices = self._expandir(inicio, fin)
+        picos = np.repeat(np.arange(len(observadas)), np.diff(punteros))
+        residuos = self.longitudes[indices] * factor + desplazamiento - observadas[picos]
+        return Candidatos(punteros, self.indice.transiciones[indices], residuos)
+
+    # Mejor transición por pico (la más cercana); filas sin candidato quedan en -1
+    def identificar(self, observadas, tolerancias, z=0.0, desplazamiento=0.0):
+        candidatos = self.candidatos(observadas, tolerancias, z, desplazamiento)
+        mejores = candidatos.mejores()
+        resultado = np.empty(len(mejores), dtype=DTYPE_TRANSICION)
+        resultado['inicial'] = resultado['final'] = -1
+        resultado['energia_eV'] = resultado['longitud_onda_nm'] = np.nan
+        residuos = np.full(len(mejores), np.nan)
+        encontrados = mejores >= 0
+        resultado[encontrados] = candidatos.transiciones[mejores[encontrados]]
+        residuos[encontrados] = candidatos.residuos[mejores[encontrados]]
+        return resultado, residuos
+
+    # Cantidad de picos identificados para cada valor de la rejilla de
+    # corrimientos (modo 'z': λ·(1+z); modo 'nm': λ + desplazamiento).
+    # Devuelve (rejilla, conteo).
+    def barrer_corrimiento(self, observadas, tolerancias, minimo, maximo, pasos=1001, modo='z'):
+        if modo not in MODOS_CORRIMIENTO:
+            raise ValueError(f"Modo de corrimiento desconocido: {modo}")
+        observadas = np.asarray(observadas, dtype=np.float64)
+        tolerancias = np.broadcast_to(np.asarray(tolerancias, dtype=np.float64), observadas.shape)
+        rejilla = np.linspace(minimo, maximo, pasos)
+        paso = (maximo - minimo) / (pasos - 1) if pasos > 1 else 1.0
+        bajos, altos = observadas - tolerancias, observadas + tolerancias
+
+        # Pares posibles en algún punto del barrido (una sola búsqueda por pico)
+        if modo == 'z':
+            inicio, fin = self._bordes(bajos / (1 + maximo), altos / (1 + minimo))
+        else:
+            inicio, fin = self._bordes(bajos - maximo, altos - minimo)
+        punteros, indices = self._expandir(inicio, fin)
+        picos = np.repeat(np.arange(len(observadas)), np.diff(punteros))
+        reposo = self.longitudes[indices]
+
+        # Intervalo de corrimientos en que cada par coincide, en pasos de la rejilla
+        if modo == 'z':
+            desde, hasta = bajos[picos] / reposo - 1, altos[picos] / reposo - 1
+        else:
+            desde, hasta = bajos[picos] - reposo, altos[picos] - reposo
+        a = np.maximum(np.ceil((desde - minimo) / paso - 1e-9).astype(np.int64), 0)
+        b = np.minimum(np.floor((hasta - minimo) / paso + 1e-9).astype(np.int64), pasos - 1)
+        validos = a <= b
+        picos, a, b = picos[validos], a[validos], b[validos]
+
+        # Unir los intervalos de cada pico: con los picos en tramos separados
+        # de la recta (pico · (pasos + 1)), un solo orden y un máximo acumulado
+        # alcanzan para detectar dónde empieza cada intervalo unido
+        base = picos * (pasos + 1)
+        a, b = a + base, b + base
+        orden = np.argsort(a, kind='stable')
+        a, b = a[orden], b[orden]
+        hasta_ahora = np.maximum.accumulate(b) if len(b) else b
+        nuevo = np.ones(len(a), dtype=bool)
+        nuevo[1:] = a[1:] > hasta_ahora[:-1]
+        grupo = np.cumsum(nuevo) - 1
+        inicios = a[nuevo]
+        finales = np.zeros(len(inicios), dtype=np.int64)
+        np.maximum.at(finales, grupo, b)
+
+        # Arreglo de diferencias sobre la rejilla
+        diferencias = np.zeros(pasos + 1, dtype=np.int64)
+        np.add.at(diferencias, inicios % (pasos + 1), 1)
+        np.add.at(diferencias, finales % (pasos + 1) + 1, -1)
+        return rejilla, np.cumsum(diferencias[:-1])
+
+    # Mejor corrimiento del barrido y la identificación con ese valor
+    def mejor_corrimiento(self, observadas, tolerancias, minimo, maximo, pasos=1001, modo='z'):
+        rejilla, conteo = self.barrer_corrimiento(observadas, tolerancias, minimo, maximo, pasos, modo)
+        mejor = rejilla[np.argmax(conteo)]
+        z, desplazamiento = (mejor, 0.0) if modo == 'z' else (0.0, mejor)
+        resultado, residuos = self.identificar(observadas, tolerancias, z, desplazamiento)
+        return mejor, int(conteo.max()), resultado, residuos
+
+
+# Programa principal: identificar picos en las transiciones de un archivo,
+# o sin archivo, chequear contra la búsqueda por fuerza bruta
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Identificación de líneas observadas")
+    parser.add_argument('transiciones', nargs='?', default=None,
+                        help="Transiciones (csv, csv.gz, npy, npz o bin); sin archivo, autochequeo")
+    parser.add_argument('--picos', type=float, nargs='+', default=[], help="λ observadas (nm)")
+    parser.add_argument('--tolerancia', type=float, default=0.5, help="Tolerancia (nm)")
+    parser.add_argument('--barrer', type=float, nargs=2, metavar=('MIN', 'MAX'), default=None,
+                        help="Barrer el corrimiento entre MIN y MAX")
+    parser.add_argument('--modo', choices=MODOS_CORRIMIENTO, default='z')
+    parser.add_argument('--pasos', type=int, default=1001)
+    args = parser.parse_args()
+
+    if args.transiciones is not None:
+        identificador = IdentificadorLineas(cargar_transiciones(args.transiciones))
+        z = desplazamiento = 0.0
+        if args.barrer:
+            mejor, cuantos, _, _ = identificador.mejor_corrimiento(
+                args.picos, args.tolerancia, *args.barrer, args.pasos, args.modo)
+            z, desplazamiento = (mejor, 0.0) if args.modo == 'z' else (0.0, mejor)
+            print(f"Mejor corrimiento ({args.modo}): {mejor:.6g} con {cuantos} picos identificados")
+        candidatos = identificador.candidatos(args.picos, args.tolerancia, z, desplazamiento)
+        for i, pico in enumerate(args.picos):
+            filas, residuos = candidatos[i]
+            texto = ', '.join(f"{t[0]}→{t[1]} ({r:+.2f} nm)"
+                              for t, r in zip(filas.tolist(), residuos.tolist())) or 'sin candidatos'
+            print(f"{pico:10.2f} nm: {texto}")
+        raise SystemExit(0)
+
+    from rydberg import transiciones_rydberg
+
+    rng = np.random.default_rng(0)
+    transiciones = np.concatenate(list(transiciones_rydberg(60, 1, 90, 5000)))
+    identificador = IdentificadorLineas(transiciones)
+    reposo = np.sort(rng.choice(transiciones['longitud_onda_nm'], 40, replace=False))
+    z_real = 0.00421
+    observadas = reposo * (1 + z_real) + rng.normal(0, 0.05, len(reposo))
+    tolerancias = rng.uniform(0.1, 0.4, len(observadas))
+
+    # Candidatos contra fuerza bruta
+    candidatos = identificador.candidatos(observadas, tolerancias, z_real)
+    wl = identificador.longitudes
+    for i in range(len(observadas)):
+        esperados = np.nonzero(np.abs(wl * (1 + z_real) - observadas[i]) <= tolerancias[i])[0]
+        filas, _ = candidatos[i]
+        assert np.array_equal(filas, identificador.indice.transiciones[esperados])
+
+    # Barrido contra identificar en cada punto de la rejilla
+    for modo, minimo, maximo in (('z', 0.0, 0.01), ('nm', -3.0, 3.0)):
+        rejilla, conteo = identificador.barrer_corrimiento(observadas, tolerancias, minimo, maximo,
+                                                           801, modo)
+        for k in range(0, len(rejilla), 37):
+            z, d = (rejilla[k], 0.0) if modo == 'z' else (0.0, rejilla[k])
+            directo = (identificador.candidatos(observadas, tolerancias, z, d).cantidades() > 0).sum()
+            assert conteo[k] == directo, (modo, k, conteo[k], directo)
+    mejor, cuantos, _, residuos = identificador.mejor_corrimiento(observadas, tolerancias, 0.0, 0.01,
+                                                                  10001)
+    print(f"{len(transiciones)} transiciones, {len(observadas)} picos: z = {mejor:.5f} "
+          f"(real {z_real}), {cuantos} identificados, residuo medio {np.nanmean(np.abs(residuos)):.3f} nm")
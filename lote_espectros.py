@@ -0,0 +1,137 @@
+import argparse
+import glob
+import hashlib
+import multiprocessing
+import os
+import shutil
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from cache_espectro import CacheEspectro, hash_archivo
+from simulador_espectro import IndiceTransiciones, guardar_transiciones, visibles_redondeadas
+
+# Procesar directorios completos de archivos de niveles en paralelo.
+# Cada dataset (leer → calcular transiciones → espectro → guardar) va a un
+# proceso del pool. Los workers se crean con 'spawn', así cada uno arranca su
+# propio matplotlib (Agg, sin pyplot) y reutiliza un único RenderizadorEspectro.
+# Los archivos con contenido idéntico se procesan una sola vez y sus
+# resultados se copian al resto. Los workers comparten la caché pero no la
+# recortan; el desalojo se hace una vez en el proceso principal al final.
+
+_renderizador = None
+
+# Un RenderizadorEspectro por proceso, creado la primera vez que se usa
+def _obtener_renderizador():
+    global _renderizador
+    if _renderizador is None:
+        from render_espectro import RenderizadorEspectro
+        _renderizador = RenderizadorEspectro()
+    return _renderizador
+
+# Nombre de salida de cada archivo: el nombre del CSV sin extensión, o si
+# otro archivo del lote se llama igual (a/x.csv y b/x.csv), con un sufijo
+# del hash de su ruta para que no se pisen
+def _nombres_salida(archivos):
+    base = {a: os.path.splitext(os.path.basename(a))[0] for a in archivos}
+    repetidos = {n for n, veces in Counter(base.values()).items() if veces > 1}
+    return {a: (f'{n}-{hashlib.sha1(os.path.abspath(a).encode()).hexdigest()[:8]}'
+                if n in repetidos else n)
+            for a, n in base.items()}
+
+# Rutas de salida de un dataset: <salida>/<nombre>_espectro.png y _transiciones.csv
+def _rutas_salida(archivo_csv, directorio_salida, nombre=None):
+    if nombre is None:
+        nombre = os.path.splitext(os.path.basename(archivo_csv))[0]
+    return (os.path.join(directorio_salida, f'{nombre}_espectro.png'),
+            os.path.join(directorio_salida, f'{nombre}_transiciones.csv'))
+
+# Trabajo de un worker: el pipeline completo para un archivo
+def procesar_dataset(archivo_csv, directorio_salida, directorio_cache=None, nombre=None):
+    cache = CacheEspectro(directorio_cache) if directorio_cache else CacheEspectro()
+    niveles, _, transiciones = cache.cargar(archivo_csv, recortar=False)
+    indice = IndiceTransiciones(transiciones, ya_ordenado=True, niveles=niveles)
+
+    archivo_png, archivo_transiciones = _rutas_salida(archivo_csv, directorio_salida, nombre)
+    visibles = _obtener_renderizador().renderizar(visibles_redondeadas(indice), archivo_png)
+    guardar_transiciones(visibles, archivo_transiciones)
+    return {
+        'transiciones': len(transiciones),
+        'visibles': len(visibles),
+        'salidas': [archivo_png, archivo_transiciones]
+    }
+
+# Procesar una lista de archivos; devuelve un resultado por archivo.
+# Un dataset que falla no detiene a los demás: su resultado lleva 'error'.
+def procesar_lote(archivos, directorio_salida, max_workers=None, directorio_cache=None):
+    os.makedirs(directorio_salida, exist_ok=True)
+
+    # Agrupar archivos por contenido para no repetir trabajo
+    grupos = {}
+    resultados = {}
+    nombres = _nombres_salida(dict.fromkeys(archivos))
+    for archivo in dict.fromkeys(archivos):
+        try:
+            grupos.setdefault(hash_archivo(archivo), []).append(archivo)
+        except OSError as e:
+            resultados[archivo] = {'archivo': archivo, 'error': repr(e)}
+
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=contexto) as pool:
+        futuros = {
+            pool.submit(procesar_dataset, grupo[0], directorio_salida, directorio_cache,
+                        nombres[grupo[0]]): grupo
+            for grupo in grupos.values()
+        }
+        for futuro in as_completed(futuros):
+            grupo = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                for archivo in grupo:
+                    resultados[archivo] = {'archivo': archivo, 'error': repr(e)}
+                continue
+
+            resultados[grupo[0]] = {'archivo': grupo[0], **resultado}
+            # Duplicados: copiar las salidas en lugar de recalcularlas
+            # (una copia que falla solo marca el error de ese archivo)
+            for archivo in grupo[1:]:
+                salidas = _rutas_salida(archivo, directorio_salida, nombres[archivo])
+                try:
+                    for origen, destino in zip(resultado['salidas'], salidas):
+                        shutil.copyfile(origen, destino)
+                except OSError as e:
+                    resultados[archivo] = {'archivo': archivo, 'error': repr(e),
+                                           'duplicado_de': grupo[0]}
+                    continue
+                resultados[archivo] = {'archivo': archivo, **resultado,
+                                       'salidas': list(salidas), 'duplicado_de': grupo[0]}
+
+    # Ya ningún worker usa la caché: recién ahora se desaloja
+    (CacheEspectro(directorio_cache) if directorio_cache else CacheEspectro()).recortar()
+    return [resultados[a] for a in dict.fromkeys(archivos)]
+
+# Procesar todos los CSV de un directorio
+def procesar_directorio(directorio, directorio_salida, patron='*.csv', max_workers=None,
+                        directorio_cache=None):
+    archivos = sorted(glob.glob(os.path.join(directorio, patron)))
+    return procesar_lote(archivos, directorio_salida, max_workers, directorio_cache)
+
+
+# Programa principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Espectros de todos los CSV de niveles de un directorio")
+    parser.add_argument('directorio', help="Directorio con los CSV de niveles")
+    parser.add_argument('-o', '--salida', default='resultados', help="Directorio de salida")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Procesos en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument('--patron', default='*.csv', help="Patrón de archivos a procesar")
+    args = parser.parse_args()
+
+    resultados = procesar_directorio(args.directorio, args.salida, args.patron, args.workers)
+    errores = [r for r in resultados if 'error' in r]
+    for r in resultados:
+        if 'error' in r:
+            print(f"✗ {r['archivo']}: {r['error']}")
+        else:
+            print(f"✓ {r['archivo']}: {r['transiciones']} transiciones, {r['visibles']} visibles")
+    print(f"Procesados {len(resultados) - len(errores)} de {len(resultados)} archivos")
+    raise SystemExit(1 if errores else 0)
@@ -0,0 +1,286 @@
+import argparse
+import html
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Perfilador opcional de las escenas de manim.
+# Se activa con la variable de entorno PERFIL_ESCENAS (su valor es el
+# directorio de salida; "1" usa render/perfiles). Mientras la escena se
+# renderiza envuelve Scene.play, Scene.wait y la construcción de Text, Code,
+# ImageMobject y SVGMobject, y registra por llamada:
+#   - segundos de reloj y línea del código de la escena que la hizo
+#   - cuadros de video producidos y cuadros realmente dibujados
+#   - cantidad de mobjects en escena (de primer nivel y con sus hijos)
+#   - con PERFIL_MEMORIA=1, además, memoria al empezar y pico durante la
+#     llamada (tracemalloc). Va aparte porque tracemalloc hace más lentas
+#     todas las asignaciones e infla los tiempos: conviene medir tiempos en
+#     una corrida sin memoria y memoria en otra.
+# Al terminar escribe <Escena>.json y <Escena>.html (gráfico de llamas: el
+# ancho es el tiempo, las llamadas anidadas van debajo de la que las contiene).
+# `python perfilador_escenas.py comparar a.json b.json` compara dos corridas.
+
+VARIABLE_ENTORNO = 'PERFIL_ESCENAS'
+VARIABLE_MEMORIA = 'PERFIL_MEMORIA'
+DIRECTORIO_PERFILES = os.path.join('render', 'perfiles')
+
+def perfilador_desde_entorno(escena):
+    destino = os.environ.get(VARIABLE_ENTORNO)
+    if not destino:
+        return None
+    return PerfiladorEscena(escena, DIRECTORIO_PERFILES if destino == '1' else destino,
+                            memoria=os.environ.get(VARIABLE_MEMORIA, '') not in ('', '0'))
+
+def _nombre_animaciones(args):
+    nombres = []
+    for a in args:
+        # animate devuelve un _AnimationBuilder; se muestra como .animate
+        nombres.append('.animate' if type(a).__name__ == '_AnimationBuilder' else type(a).__name__)
+    return ', '.join(nombres)
+
+class PerfiladorEscena:
+    def __init__(self, escena, directorio=DIRECTORIO_PERFILES, memoria=False):
+        self.escena = escena
+        self.directorio = directorio
+        self.memoria = memoria
+        self.archivo_escena = os.path.abspath(inspect.getfile(type(escena)))
+        self.llamadas = []
+        self.pila = []
+        self.cuadros = 0
+        self.cuadros_dibujados = 0
+        self._originales = []
+
+    # Línea del archivo de la escena desde donde se hizo la llamada
+    def _linea_origen(self):
+        frame = sys._getframe(2)
+        while frame is not None:
+            if os.path.abspath(frame.f_code.co_filename) == self.archivo_escena:
+                return f"{os.path.basename(self.archivo_escena)}:{frame.f_lineno}"
+            frame = frame.f_back
+        return None
+
+    def _entrar(self, tipo, nombre):
+        actual = None  # sin PERFIL_MEMORIA no se mide memoria
+        if self.memoria:
+            actual, pico = tracemalloc.get_traced_memory()
+            if self.pila:
+                self.pila[-1]['memoria_pico'] = max(self.pila[-1]['memoria_pico'], pico)
+            tracemalloc.reset_peak()
+        registro = {
+            'tipo': tipo,
+            'nombre': nombre,
+            'linea': self._linea_origen(),
+            'profundidad': len(self.pila),
+            'inicio': time.perf_counter() - self.t0,
+            'memoria_inicio': actual,
+            'memoria_pico': actual,
+            'cuadros': self.cuadros,
+            'cuadros_dibujados': self.cuadros_dibujados
+        }
+        self.pila.append(registro)
+        return registro
+
+    def _salir(self, registro):
+        registro['segundos'] = time.perf_counter() - self.t0 - registro['inicio']
+        if self.memoria:
+            registro['memoria_pico'] = max(registro['memoria_pico'],
+                                           tracemalloc.get_traced_memory()[1])
+        registro['cuadros'] = self.cuadros - registro['cuadros']
+        registro['cuadros_dibujados'] = self.cuadros_dibujados - registro['cuadros_dibujados']
+        registro['mobjects'] = len(self.escena.mobjects)
+        registro['mobjects_familia'] = sum(len(m.get_family()) for m in self.escena.mobjects)
+        self.pila.pop()
+        if self.pila and self.memoria:
+            self.pila[-1]['memoria_pico'] = max(self.pila[-1]['memoria_pico'], registro['memoria_pico'])
+        self.llamadas.append(registro)
+
+    def _envolver(self, funcion, tipo, nombre):
+        perfilador = self
+
+        def envuelta(*args, **kwargs):
+            registro = perfilador._entrar(tipo, nombre(args, kwargs))
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                perfilador._salir(registro)
+        return envuelta
+
+    def _parchar(self, objeto, atributo, nueva):
+        self._originales.append((objeto, atributo, objeto.__dict__.get(atributo)))
+        setattr(objeto, atributo, nueva)
+
+    def __enter__(self):
+        from manim import Code, ImageMobject, SVGMobject, Text
+
+        escena = self.escena
+        self.t0 = time.perf_counter()
+        self._tracemalloc_previo = tracemalloc.is_tracing()
+        if self.memoria and not self._tracemalloc_previo:
+            tracemalloc.start()
+
+        # play y wait se parchan en la instancia; wait llama a play por dentro
+        self._parchar(escena, 'play', self._envolver(
+            escena.play, 'play', lambda a, k: f"play({_nombre_animaciones(a)})"))
+        self._parchar(escena, 'wait', self._envolver(
+            escena.wait, 'wait', lambda a, k: f"wait({a[0] if a else k.get('duration', '')})"))
+
+        # Cuadros producidos (num_frames) y cuadros dibujados (llamadas)
+        renderer = escena.renderer
+        add_frame = renderer.add_frame
+
+        def contar(frame, num_frames=1):
+            self.cuadros += num_frames
+            self.cuadros_dibujados += 1
+            return add_frame(frame, num_frames)
+        self._parchar(renderer, 'add_frame', contar)
+
+        # Construcción de mobjects caros, en la clase durante el render
+        for clase in (Text, Code, ImageMobject, SVGMobject):
+            self._parchar(clase, '__init__', self._envolver(
+                clase.__init__, 'construir',
+                lambda a, k, clase=clase: f"{clase.__name__}({type(a[0]).__name__})"
+                if type(a[0]) is not clase else clase.__name__))
+        self.escena_registro = self._entrar('escena', type(escena).__name__)
+        return self
+
+    def __exit__(self, *exc):
+        self._salir(self.escena_registro)
+        for objeto, atributo, original in reversed(self._originales):
+            if original is None:
+                delattr(objeto, atributo)
+            else:
+                setattr(objeto, atributo, original)
+        self._originales = []
+        if self.memoria and not self._tracemalloc_previo:
+            tracemalloc.stop()
+        self.guardar()
+        return False
+
+    def informe(self):
+        return {
+            'escena': type(self.escena).__name__,
+            'archivo': os.path.basename(self.archivo_escena),
+            'segundos': self.escena_registro['segundos'],
+            'memoria': self.memoria,
+            'llamadas': sorted(self.llamadas, key=lambda r: r['inicio']),
+            'por_linea': resumen_por_linea(self.llamadas)
+        }
+
+    def guardar(self):
+        os.makedirs(self.directorio, exist_ok=True)
+        informe = self.informe()
+        base = os.path.join(self.directorio, informe['escena'])
+        with open(base + '.json', 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=2, ensure_ascii=False)
+        with open(base + '.html', 'w', encoding='utf-8') as f:
+            f.write(html_llamas(informe))
+        return base + '.json'
+
+# Tiempo total por (tipo, nombre, línea), solo llamadas de primer nivel dentro
+# de la escena para no contar dos veces lo anidado
+def resumen_por_linea(llamadas):
+    totales = {}
+    for r in llamadas:
+        if r['tipo'] == 'escena' or r['profundidad'] != 1:
+            continue
+        clave = f"{r['linea']} {r['nombre']}"
+        t = totales.setdefault(clave, {'llamadas': 0, 'segundos': 0.0, 'cuadros': 0,
+                                        'memoria_pico': None})
+        t['llamadas'] += 1
+        t['segundos'] += r['segundos']
+        t['cuadros'] += r['cuadros']
+        if r['memoria_pico'] is not None:
+            t['memoria_pico'] = max(t['memoria_pico'] or 0, r['memoria_pico'])
+    return dict(sorted(totales.items(), key=lambda kv: -kv[1]['segundos']))
+
+# Bytes en MiB para el informe; '—' si la corrida no midió memoria
+def _mib(bytes_):
+    return '—' if bytes_ is None else f"{bytes_ / 1024 ** 2:.1f}"
+
+COLORES_TIPO = {'escena': '#9e9e9e', 'play': '#ef6c00', 'wait': '#fbc02d',
+                'construir': '#1e88e5'}
+
+# Gráfico de llamas en HTML autocontenido (sin dependencias)
+def html_llamas(informe, alto_fila=22):
+    total = informe['segundos'] or 1.0
+    filas = max((r['profundidad'] for r in informe['llamadas']), default=0) + 1
+    bloques = []
+    for r in informe['llamadas']:
+        izquierda = 100 * r['inicio'] / total
+        ancho = max(100 * r['segundos'] / total, 0.05)
+        detalle = (f"{r['nombre']} — {r['linea'] or '?'}\n"
+                   f"{r['segundos'] * 1000:.1f} ms, {r['cuadros']} cuadros "
+                   f"({r['cuadros_dibujados']} dibujados)\n"
+                   f"{r['mobjects']} mobjects ({r['mobjects_familia']} con hijos)\n"
+                   f"pico {_mib(r['memoria_pico'])} MiB")
+        bloques.append(
+            f'<div class="b" style="left:{izquierda:.4f}%;width:{ancho:.4f}%;'
+            f'top:{r["profundidad"] * alto_fila}px;background:{COLORES_TIPO[r["tipo"]]}" '
+            f'title="{html.escape(detalle)}">{html.escape(r["nombre"])}</div>')
+    tabla = ''.join(
+        f"<tr><td>{html.escape(k)}</td><td>{v['llamadas']}</td>"
+        f"<td>{v['segundos'] * 1000:.1f}</td><td>{v['cuadros']}</td>"
+        f"<td>{_mib(v['memoria_pico'])}</td></tr>"
+        for k, v in informe['por_linea'].items())
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Perfil {html.escape(informe['escena'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 20px; }}
+#llamas {{ position: relative; height: {filas * alto_fila}px; border: 1px solid #ccc; }}
+.b {{ position: absolute; height: {alto_fila - 2}px; overflow: hidden; white-space: nowrap;
+      font-size: 11px; line-height: {alto_fila - 2}px; color: #000; box-sizing: border-box;
+      border-right: 1px solid #fff; padding-left: 2px; }}
+table {{ border-collapse: collapse; margin-top: 20px; }}
+td, th {{ border: 1px solid #ccc; padding: 2px 8px; text-align: right; }}
+td:first-child {{ text-align: left; font-family: monospace; }}
+</style></head><body>
+<h2>{html.escape(informe['escena'])} — {informe['segundos']:.2f} s</h2>
+<div id="llamas">{''.join(bloques)}</div>
+<table><tr><th>Línea y llamada</th><th>Llamadas</th><th>ms</th><th>Cuadros</th><th>Pico MiB</th></tr>
+{tabla}</table>
+</body></html>
+"""
+
+# Diferencias por línea entre dos informes (b contra a), de mayor a menor
+def comparar_perfiles(a, b):
+    claves = set(a['por_linea']) | set(b['por_linea'])
+    filas = []
+    for clave in claves:
+        antes = a['por_linea'].get(clave, {}).get('segundos', 0.0)
+        despues = b['por_linea'].get(clave, {}).get('segundos', 0.0)
+        filas.append((clave, antes, despues, despues - antes))
+    return sorted(filas, key=lambda f: -abs(f[3]))
+
+
+# Programa principal: resumen de un informe o comparación entre dos
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Informes del perfilador de escenas")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_resumen = sub.add_parser('resumen', help="Llamadas más caras de un informe")
+    p_resumen.add_argument('informe')
+    p_resumen.add_argument('-n', type=int, default=15)
+    p_comparar = sub.add_parser('comparar', help="Diferencias por línea entre dos corridas")
+    p_comparar.add_argument('antes')
+    p_comparar.add_argument('despues')
+    p_comparar.add_argument('-n', type=int, default=15)
+    args = parser.parse_args()
+
+    if args.comando == 'resumen':
+        with open(args.informe, encoding='utf-8') as f:
+            informe = json.load(f)
+        print(f"{informe['escena']}: {informe['segundos']:.2f} s")
+        for clave, v in list(informe['por_linea'].items())[:args.n]:
+            print(f"{v['segundos'] * 1000:10.1f} ms  {v['llamadas']:4d}x  "
+                  f"{v['cuadros']:6d} cuadros  {clave}")
+    else:
+        with open(args.antes, encoding='utf-8') as f:
+            antes = json.load(f)
+        with open(args.despues, encoding='utf-8') as f:
+            despues = json.load(f)
+        print(f"{antes['escena']}: {antes['segundos']:.2f} s → {despues['segundos']:.2f} s")
+        for clave, t_antes, t_despues, delta in comparar_perfiles(antes, despues)[:args.n]:
+            print(f"{t_antes * 1000:10.1f} → {t_despues * 1000:10.1f} ms  "
+                  f"({delta * 1000:+.1f})  {clave}")
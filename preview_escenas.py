@@ -0,0 +1,104 @@
+import json
+import os
+import sys
+from manim import config
+
+# Modo borrador para ajustar tiempos sin hacer renders completos.
+# Se activa con PREVIEW_ESCENAS=N (lo hace `render_escenas.py --preview N`):
+#   - resolución dividida por PREVIEW_ESCALA (4 por defecto)
+#   - frame_rate dividido por N: cada animación muestrea uno de cada N cuadros
+#     y dura lo mismo que en el render final
+#   - las pausas (self.wait) se reducen a un solo cuadro
+#   - se escribe un sidecar <Escena>.tiempos.json en PREVIEW_TIEMPOS con el
+#     inicio y el fin reales (los del render final) de cada play/wait y la
+#     línea del código que lo hizo, para revisar el ritmo en segundos
+# Las escenas usan siempre la misma semilla (SEMILLA_ESCENAS), así que las
+# posiciones de np.random.uniform del preview son las del render final.
+
+VARIABLE_PASO = 'PREVIEW_ESCENAS'
+VARIABLE_ESCALA = 'PREVIEW_ESCALA'
+VARIABLE_TIEMPOS = 'PREVIEW_TIEMPOS'
+ESCALA_PREVIEW = 4
+DIRECTORIO_TIEMPOS = os.path.join('render', 'preview', 'tiempos')
+SEMILLA_ESCENAS = 7
+
+_config_original = None
+
+def paso_preview():
+    valor = os.environ.get(VARIABLE_PASO)
+    if not valor:
+        return None
+    paso = int(valor)
+    if paso < 1:
+        raise ValueError(f"{VARIABLE_PASO} debe ser un entero positivo, no {valor!r}")
+    return paso
+
+# Ajustar la config de manim antes de crear la escena (siempre a partir de
+# los valores originales, por si el proceso renderiza varias escenas)
+def aplicar_config_preview(paso, escala=None):
+    global _config_original
+    if escala is None:
+        escala = int(os.environ.get(VARIABLE_ESCALA, ESCALA_PREVIEW))
+    if _config_original is None:
+        _config_original = (config.frame_rate, config.pixel_width, config.pixel_height)
+    frame_rate, ancho, alto = _config_original
+    config.frame_rate = max(1, round(frame_rate / paso))
+    # Dimensiones pares para el codificador
+    config.pixel_width = max(2, ancho // escala // 2 * 2)
+    config.pixel_height = max(2, alto // escala // 2 * 2)
+
+class LineaTiempo:
+    def __init__(self, clase_escena, directorio=None):
+        self.escena = clase_escena.__name__
+        self.archivo_escena = os.path.abspath(sys.modules[clase_escena.__module__].__file__)
+        self.directorio = directorio or os.environ.get(VARIABLE_TIEMPOS, DIRECTORIO_TIEMPOS)
+        self.segmentos = []
+        self.tiempo = 0.0
+        self.ocupada = False
+
+    # Línea del archivo de la escena desde donde se llamó a play/wait
+    def _linea_origen(self):
+        frame = sys._getframe(1)
+        while frame is not None:
+            if os.path.abspath(frame.f_code.co_filename) == self.archivo_escena:
+                return frame.f_lineno
+            frame = frame.f_back
+        return None
+
+    def agregar(self, tipo, duracion, run_time_preview):
+        self.segmentos.append({
+            'tipo': tipo,
+            'linea': self._linea_origen(),
+            'inicio': round(self.tiempo, 6),
+            'fin': round(self.tiempo + duracion, 6),
+            'duracion': round(duracion, 6),
+            'duracion_preview': round(run_time_preview, 6)
+        })
+        self.tiempo += duracion
+
+    def guardar(self):
+        os.makedirs(self.directorio, exist_ok=True)
+        archivo = os.path.join(self.directorio, f'{self.escena}.tiempos.json')
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump({'escena': self.escena,
+                       'archivo': os.path.basename(self.archivo_escena),
+                       'duracion': round(self.tiempo, 6),
+                       'frame_rate_preview': config.frame_rate,
+                       'segmentos': self.segmentos}, f, indent=2, ensure_ascii=False)
+        return archivo
+
+# Unir los sidecars de varias escenas en una sola línea de tiempo, en orden
+def unir_tiempos(archivos, archivo_salida):
+    escenas = []
+    desplazamiento = 0.0
+    for archivo in archivos:
+        with open(archivo, encoding='utf-8') as f:
+            datos = json.load(f)
+        escenas.append({'escena': datos['escena'], 'inicio': round(desplazamiento, 6),
+                        'fin': round(desplazamiento + datos['duracion'], 6),
+                        'segmentos': datos['segmentos']})
+        desplazamiento += datos['duracion']
+    with open(archivo_salida, 'w', encoding='utf-8') as f:
+        json.dump({'duracion': round(desplazamiento, 6), 'escenas': escenas}, f, indent=2,
+                  ensure_ascii=False)
+    return archivo_salida
@@ -0,0 +1,228 @@
+import argparse
+import ast
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Render en paralelo de las escenas de un módulo de manim.
+# Descubre todas las subclases de Scene definidas en el módulo (en el orden en
+# que están declaradas), lanza una invocación de manim por escena (un
+# subproceso cada una, así que alcanza con un pool de hilos que las espere) y
+# concatena los videos parciales en ese mismo orden. Con --escenas el video
+# de ese subconjunto va a un archivo aparte y no pisa el video completo.
+# Una escena se vuelve a renderizar solo si cambió su huella: el código de la
+# clase, el código común del módulo (Robot, config, imports), los módulos
+# locales importados, los archivos de assets que menciona y las opciones de render.
+# Con --preview N las escenas se renderizan en modo borrador (preview_escenas.py)
+# en un directorio aparte, y se arma además la línea de tiempo de todo el video.
+
+MODULO_ESCENAS = 'for_vs_while_manim.py'
+DIRECTORIO_RENDER = 'render'
+DIRECTORIO_PREVIEW = os.path.join('render', 'preview')
+VIDEO_FINAL = 'for_vs_while.mp4'
+VIDEO_PARCIAL = 'for_vs_while_parcial.mp4'  # solo las escenas de --escenas
+
+# Importar el módulo y listar sus escenas en orden de declaración
+def descubrir_escenas(archivo_modulo):
+    from manim import Scene
+
+    nombre = os.path.splitext(os.path.basename(archivo_modulo))[0]
+    spec = importlib.util.spec_from_file_location(nombre, archivo_modulo)
+    modulo = importlib.util.module_from_spec(spec)
+    sys.modules[nombre] = modulo
+    spec.loader.exec_module(modulo)
+
+    escenas = [obj for obj in vars(modulo).values()
+               if inspect.isclass(obj) and issubclass(obj, Scene)
+               and obj.__module__ == nombre]
+    escenas.sort(key=lambda cls: inspect.getsourcelines(cls)[1])
+    return [cls.__name__ for cls in escenas]
+
+def _hash_archivo(ruta):
+    with open(ruta, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+# Huella de cada escena (nombre -> sha256), calculada sin importar manim
+def huellas_escenas(archivo_modulo, escenas, opciones_render):
+    directorio = os.path.dirname(os.path.abspath(archivo_modulo))
+    with open(archivo_modulo, encoding='utf-8') as f:
+        fuente = f.read()
+    arbol = ast.parse(fuente)
+
+    clases = {n.name: n for n in arbol.body if isinstance(n, ast.ClassDef)}
+    comunes = [n for n in arbol.body
+               if not (isinstance(n, ast.ClassDef) and n.name in escenas)]
+
+    # Archivos que el código menciona por nombre y existen junto al módulo,
+    # más los módulos locales que importa (y los que importan esos, etc.)
+    def archivos_mencionados(nodos):
+        rutas = set()
+        pendientes = list(nodos)
+        while pendientes:
+            for sub in ast.walk(pendientes.pop()):
+                nuevas = []
+                if isinstance(sub, ast.Constant) and isinstance(sub.value, str):
+                    nuevas = [os.path.join(directorio, sub.value)]
+                elif isinstance(sub, (ast.Import, ast.ImportFrom)):
+                    modulos = ([sub.module] if isinstance(sub, ast.ImportFrom) and sub.module
+                               else [a.name for a in getattr(sub, 'names', [])])
+                    nuevas = [os.path.join(directorio, m.replace('.', os.sep) + '.py')
+                              for m in modulos]
+                for ruta in nuevas:
+                    if os.path.isfile(ruta) and ruta not in rutas:
+                        rutas.add(ruta)
+                        if ruta.endswith('.py'):
+                            with open(ruta, encoding='utf-8') as f:
+                                pendientes.append(ast.parse(f.read()))
+        return rutas
+
+    base = hashlib.sha256()
+    base.update(json.dumps(opciones_render, sort_keys=True).encode())
+    for nodo in comunes:
+        base.update(ast.get_source_segment(fuente, nodo).encode())
+    for ruta in sorted(archivos_mencionados(comunes)):
+        base.update(_hash_archivo(ruta).encode())
+
+    huellas = {}
+    for escena in escenas:
+        h = base.copy()
+        h.update(ast.get_source_segment(fuente, clases[escena]).encode())
+        for ruta in sorted(archivos_mencionados([clases[escena]])):
+            h.update(_hash_archivo(ruta).encode())
+        huellas[escena] = h.hexdigest()
+    return huellas
+
+# Trabajo de un hilo del pool: una invocación de manim para una escena
+def renderizar_escena(archivo_modulo, escena, directorio_render, calidad, extra=(), entorno=None):
+    archivo_modulo = os.path.abspath(archivo_modulo)
+    directorio_render = os.path.abspath(directorio_render)
+    media = os.path.join(directorio_render, 'media', escena)
+    registro = os.path.join(directorio_render, 'logs', f'{escena}.log')
+    os.makedirs(os.path.dirname(registro), exist_ok=True)
+    comando = [sys.executable, '-m', 'manim', 'render', '-q', calidad,
+               '--media_dir', media, '-o', escena, *extra, archivo_modulo, escena]
+    with open(registro, 'w') as log:
+        proceso = subprocess.run(comando, stdout=log, stderr=subprocess.STDOUT,
+                                 cwd=os.path.dirname(archivo_modulo),
+                                 env={**os.environ, **(entorno or {})})
+    if proceso.returncode != 0:
+        raise RuntimeError(f"manim terminó con código {proceso.returncode} (ver {registro})")
+
+    # El video queda en media/videos/<modulo>/<calidad>/<escena>.mp4
+    for raiz, _, archivos in os.walk(os.path.join(media, 'videos')):
+        if f'{escena}.mp4' in archivos and 'partial_movie_files' not in raiz:
+            destino = os.path.join(directorio_render, 'escenas', f'{escena}.mp4')
+            os.makedirs(os.path.dirname(destino), exist_ok=True)
+            shutil.copyfile(os.path.join(raiz, f'{escena}.mp4'), destino)
+            return destino
+    raise RuntimeError(f"No se encontró el video de {escena} en {media}")
+
+# Unir los videos en orden sin recodificar (demuxer concat, como hace manim)
+def concatenar_videos(videos, archivo_salida):
+    import av
+    from io import BytesIO
+
+    lista = ''.join(f"file 'file:{os.path.abspath(v)}'\n" for v in videos).encode()
+    entrada = av.open(BytesIO(lista), format='concat', options={'safe': '0'})
+    flujo_entrada = entrada.streams.video[0]
+    salida = av.open(archivo_salida, mode='w')
+    flujo_salida = salida.add_stream_from_template(template=flujo_entrada)
+    for paquete in entrada.demux(flujo_entrada):
+        if paquete.dts is None:
+            continue
+        paquete.dts = None
+        paquete.stream = flujo_salida
+        salida.mux(paquete)
+    entrada.close()
+    salida.close()
+
+# Renderizar las escenas que cambiaron y armar el video final
+def renderizar_todo(archivo_modulo=MODULO_ESCENAS, directorio_render=DIRECTORIO_RENDER,
+                    calidad='h', max_workers=None, escenas=None, forzar=False, extra=(),
+                    preview=None):
+    from preview_escenas import VARIABLE_PASO, VARIABLE_TIEMPOS, unir_tiempos
+
+    todas = descubrir_escenas(archivo_modulo)
+    escenas = [e for e in todas if escenas is None or e in escenas]
+    opciones = {'calidad': calidad, 'extra': list(extra), 'preview': preview}
+    directorio_tiempos = os.path.abspath(os.path.join(directorio_render, 'tiempos'))
+    entorno = ({VARIABLE_PASO: str(preview), VARIABLE_TIEMPOS: directorio_tiempos}
+               if preview else {})
+    huellas = huellas_escenas(archivo_modulo, escenas, opciones)
+
+    archivo_manifiesto = os.path.join(directorio_render, 'manifiesto.json')
+    manifiesto = {}
+    if os.path.exists(archivo_manifiesto):
+        with open(archivo_manifiesto) as f:
+            manifiesto = json.load(f)
+
+    videos = {e: os.path.join(directorio_render, 'escenas', f'{e}.mp4') for e in escenas}
+    pendientes = [e for e in escenas
+                  if forzar or manifiesto.get(e) != huellas[e] or not os.path.exists(videos[e])]
+    for e in escenas:
+        if e not in pendientes:
+            print(f"= {e}: sin cambios, se reutiliza")
+
+    errores = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futuros = {e: pool.submit(renderizar_escena, archivo_modulo, e, directorio_render,
+                                  calidad, tuple(extra), entorno)
+                   for e in pendientes}
+        for escena, futuro in futuros.items():
+            try:
+                futuro.result()
+                manifiesto[escena] = huellas[escena]
+                print(f"✓ {escena}")
+            except Exception as e:
+                manifiesto.pop(escena, None)
+                errores[escena] = e
+                print(f"✗ {escena}: {e}")
+
+    os.makedirs(directorio_render, exist_ok=True)
+    with open(archivo_manifiesto, 'w') as f:
+        json.dump(manifiesto, f, indent=2)
+
+    if errores:
+        return None, errores
+    completo = escenas == todas
+    archivo_final = os.path.join(directorio_render, VIDEO_FINAL if completo else VIDEO_PARCIAL)
+    concatenar_videos([videos[e] for e in escenas], archivo_final)
+    if preview:
+        unir_tiempos([os.path.join(directorio_tiempos, f'{e}.tiempos.json') for e in escenas],
+                     os.path.join(directorio_render,
+                                  'tiempos.json' if completo else 'tiempos_parcial.json'))
+    return archivo_final, errores
+
+
+# Programa principal
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render en paralelo de las escenas del video")
+    parser.add_argument('modulo', nargs='?', default=MODULO_ESCENAS)
+    parser.add_argument('-q', '--calidad', default='h', choices=['l', 'm', 'h', 'p', 'k'],
+                        help="Calidad final; --preview la reduce a partir de esta")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="Escenas en paralelo (por defecto, todos los núcleos)")
+    parser.add_argument('-o', '--directorio', default=None,
+                        help=f"Por defecto {DIRECTORIO_RENDER}, o {DIRECTORIO_PREVIEW} con --preview")
+    parser.add_argument('--escenas', nargs='+', default=None,
+                        help="Solo estas escenas (por defecto, todas en orden); su video "
+                             f"va a {VIDEO_PARCIAL}")
+    parser.add_argument('--forzar', action='store_true', help="Renderizar aunque no haya cambios")
+    parser.add_argument('--preview', type=int, nargs='?', const=4, default=None, metavar='N',
+                        help="Borrador: 1 de cada N cuadros (4 si no se indica), "
+                             "resolución reducida y pausas de un cuadro")
+    args = parser.parse_args()
+
+    directorio = args.directorio or (DIRECTORIO_PREVIEW if args.preview else DIRECTORIO_RENDER)
+    archivo_final, errores = renderizar_todo(args.modulo, directorio, args.calidad, args.workers,
+                                             args.escenas, args.forzar, preview=args.preview)
+    if errores:
+        print(f"{len(errores)} escena(s) fallaron; no se armó el video final")
+        raise SystemExit(1)
+    print(f"{'Video parcial' if archivo_final.endswith(VIDEO_PARCIAL) else 'Video final'} en '{archivo_final}'")
@@ -0,0 +1,93 @@
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+from matplotlib.cm import ScalarMappable
+from matplotlib.figure import Figure
+from rydberg import etiquetas_series
+from simulador_espectro import (IndiceTransiciones, RANGO_VISIBLE,
+                                transiciones_a_arreglo)
+
+# Renderizador de espectros sin interfaz (Agg) para trabajos por lotes.
+# La figura, los ejes, las anotaciones y la barra de color se crean una sola
+# vez; cada espectro solo cambia los segmentos y colores del LineCollection
+# y la escala de la barra de color antes de savefig. No usa pyplot, así que
+# no depende del backend activo ni llama nunca a plt.show().
+# Las anotaciones de series (Hα, Hβ, …) salen de las transiciones de cada
+# espectro; los textos ya creados se reutilizan entre espectros.
+
+class RenderizadorEspectro:
+    def __init__(self, titulo='Espectro Atómico del Hidrógeno', ancho_linea=2,
+                 alturas_proporcionales=False, dpi=150):
+        self.alturas_proporcionales = alturas_proporcionales
+        self.dpi = dpi
+        self.cmap = colormaps['plasma']
+
+        self.fig = Figure(figsize=(12, 6))
+        FigureCanvasAgg(self.fig)
+        ax = self.fig.add_subplot()
+        self.ax = ax
+
+        self.lc = LineCollection([], linewidths=ancho_linea)
+        ax.add_collection(self.lc)
+
+        # Configurar ejes
+        ax.set_xlim(*RANGO_VISIBLE)
+        ax.set_ylim(0, 1.2)
+        ax.set_title(titulo, fontsize=14)
+        ax.set_xlabel('Longitud de onda (nm)', fontsize=12)
+        ylabel = 'Intensidad relativa (normalizada)' if alturas_proporcionales else 'Intensidad relativa'
+        ax.set_ylabel(ylabel, fontsize=12)
+        ax.grid(True, alpha=0.3)
+
+        self.etiquetas = []
+
+        # Barra de color; su escala se ajusta en cada espectro
+        self.sm = ScalarMappable(cmap=self.cmap, norm=Normalize(0, 1))
+        self.sm.set_array([])
+        cbar = self.fig.colorbar(self.sm, ax=ax)
+        cbar.set_label('Energía (eV)', fontsize=10)
+
+        self.fig.tight_layout()
+
+    # Dibujar un espectro y guardarlo; devuelve las transiciones visibles
+    def renderizar(self, transiciones, archivo_salida):
+        if isinstance(transiciones, IndiceTransiciones):
+            visibles = transiciones.visibles()
+        else:
+            transiciones = transiciones_a_arreglo(transiciones)
+            wl = transiciones['longitud_onda_nm']
+            visibles = transiciones[(wl > RANGO_VISIBLE[0]) & (wl < RANGO_VISIBLE[1])]
+
+        wl = visibles['longitud_onda_nm']
+        intensidades = visibles['energia_eV']
+        max_intensidad = intensidades.max() if len(intensidades) else 1
+        relativas = intensidades / max_intensidad
+
+        # Segmentos (n, 2, 2): de (wl, 0) a (wl, altura)
+        segmentos = np.zeros((len(visibles), 2, 2))
+        segmentos[:, :, 0] = wl[:, None]
+        segmentos[:, 1, 1] = relativas if self.alturas_proporcionales else 1
+
+        self.lc.set_segments(segmentos)
+        self.lc.set_color(self.cmap(relativas))
+        self.sm.set_clim(0, max_intensidad)
+        self._anotar(etiquetas_series(visibles, *RANGO_VISIBLE))
+
+        self.fig.savefig(archivo_salida, dpi=self.dpi)
+        return visibles
+
+    # Reusar los textos de anotación; los que sobran quedan ocultos
+    def _anotar(self, etiquetas):
+        while len(self.etiquetas) < len(etiquetas):
+            self.etiquetas.append(self.ax.text(0, 1.05, '', ha='center', fontsize=9, rotation=90))
+        for texto, (wl, label) in zip(self.etiquetas, etiquetas.items()):
+            texto.set_x(wl)
+            texto.set_text(label)
+            texto.set_visible(True)
+        for texto in self.etiquetas[len(etiquetas):]:
+            texto.set_visible(False)
+
+    def cerrar(self):
+        self.fig.clear()
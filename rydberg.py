@@ -0,0 +1,194 @@
+import heapq
+import numpy as np
+from simulador_espectro import DTYPE_TRANSICION
+
+# Niveles y transiciones de iones hidrogenoides a partir de la fórmula de Rydberg:
+#   E_n = -R·Z²/n²        1/λ = R·Z²/(hc) · (1/nf² − 1/ni²)
+# Con n_max = 10⁵ hay ~5·10⁹ pares, así que nada de esto arma la lista completa:
+# transiciones_rydberg() las genera por bloques, serie por serie (nf = 1, 2, 3…)
+# y dentro de cada serie en orden creciente de longitud de onda. Para una
+# ventana [lmin, lmax] los ni que caen adentro salen despejando la fórmula, así
+# que las series y los tramos fuera de la ventana ni se recorren.
+# lineas_mas_intensas() responde "las k líneas más fuertes de la ventana" con
+# un heap de tamaño k, y etiquetas_series() arma las anotaciones (Hα, Pβ, …)
+# a partir de las transiciones que efectivamente hay en los datos.
+
+RYDBERG_EV = 13.605693122994
+HC_EV_NM = 1239.841984
+TAMANO_BLOQUE = 1 << 16
+
+SIMBOLOS_SERIE = {1: 'Ly', 2: 'H', 3: 'Pa', 4: 'Br', 5: 'Pf', 6: 'Hu'}
+LETRAS_GRIEGAS = ('alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'eta', 'theta')
+
+# Niveles n = 1..n_max con su energía (eV)
+def niveles_rydberg(n_max, Z=1):
+    niveles = np.arange(1, n_max + 1, dtype=np.int64)
+    return niveles, -RYDBERG_EV * Z ** 2 / niveles.astype(np.float64) ** 2
+
+def energia_transicion(ni, nf, Z=1):
+    ni = np.asarray(ni, dtype=np.float64)
+    nf = np.asarray(nf, dtype=np.float64)
+    return RYDBERG_EV * Z ** 2 * (1 / nf ** 2 - 1 / ni ** 2)
+
+def longitud_onda_nm(ni, nf, Z=1):
+    return HC_EV_NM / energia_transicion(ni, nf, Z)
+
+# Rango [ni_min, ni_max] de la serie nf con λ dentro de [lmin, lmax], o None.
+# λ crece al bajar ni: λ ≤ lmax fija el ni mínimo y λ ≥ lmin el máximo.
+def rango_inicial(nf, n_max, Z=1, lmin=None, lmax=None):
+    a = HC_EV_NM / (RYDBERG_EV * Z ** 2)
+    ni_min, ni_max = nf + 1, n_max
+    if lmax is not None:
+        resto = 1 / nf ** 2 - a / lmax
+        if resto <= 0:
+            return None  # hasta el límite de la serie queda por encima de lmax
+        ni_min = max(ni_min, int(np.floor(1 / np.sqrt(resto))))
+    if lmin is not None:
+        resto = 1 / nf ** 2 - a / lmin
+        if resto > 0:
+            ni_max = min(ni_max, int(np.ceil(1 / np.sqrt(resto))))
+    # Corregir el redondeo de la raíz en los bordes
+    while ni_min <= ni_max and lmax is not None and longitud_onda_nm(ni_min, nf, Z) > lmax:
+        ni_min += 1
+    while ni_max >= ni_min and lmin is not None and longitud_onda_nm(ni_max, nf, Z) < lmin:
+        ni_max -= 1
+    return (ni_min, ni_max) if ni_min <= ni_max else None
+
+# Series que pueden tener líneas en la ventana (nf creciente). El límite de la
+# serie nf es λ = a·nf², así que pasado lmax no hay más series que recorrer.
+def _series(n_max, Z, lmin, lmax, series):
+    a = HC_EV_NM / (RYDBERG_EV * Z ** 2)
+    for nf in (range(1, n_max) if series is None else sorted(series)):
+        if nf >= n_max:
+            break
+        if lmax is not None and a * nf ** 2 > lmax:
+            break
+        rango = rango_inicial(nf, n_max, Z, lmin, lmax)
+        if rango is not None:
+            yield nf, rango
+
+def _bloque(ni, nf, Z):
+    bloque = np.empty(len(ni), dtype=DTYPE_TRANSICION)
+    bloque['inicial'] = ni
+    bloque['final'] = nf
+    bloque['energia_eV'] = energia_transicion(ni, nf, Z)
+    bloque['longitud_onda_nm'] = HC_EV_NM / bloque['energia_eV']
+    return bloque
+
+# Generador de bloques de transiciones (arreglos DTYPE_TRANSICION sin
+# redondear), serie por serie y en longitud de onda creciente dentro de cada una
+def transiciones_rydberg(n_max, Z=1, lmin=None, lmax=None, series=None,
+                         tamano_bloque=TAMANO_BLOQUE):
+    for nf, (ni_min, ni_max) in _series(n_max, Z, lmin, lmax, series):
+        for hasta in range(ni_max, ni_min - 1, -tamano_bloque):
+            desde = max(ni_min, hasta - tamano_bloque + 1)
+            yield _bloque(np.arange(hasta, desde - 1, -1, dtype=np.int64), nf, Z)
+
+# Probabilidad de transición en la aproximación semiclásica de Kramers,
+# A ∝ Z⁴ / (ni³·nf·(ni² − nf²)); decrece con ni dentro de cada serie
+def intensidad_kramers(ni, nf, Z=1):
+    ni = np.asarray(ni, dtype=np.float64)
+    nf = np.asarray(nf, dtype=np.float64)
+    return Z ** 4 / (ni ** 3 * nf * (ni ** 2 - nf ** 2))
+
+# Las k líneas más intensas de la ventana, de mayor a menor.
+# Con la intensidad de Kramers (monótona en ni) alcanza con los k primeros ni
+# de cada serie y se corta cuando la mejor línea posible de la serie siguiente
+# ya no entra en el heap; con otra función de intensidad se recorre todo.
+# Devuelve (transiciones, intensidades); la memoria es O(k + tamano_bloque).
+def lineas_mas_intensas(k, n_max, Z=1, lmin=None, lmax=None, intensidad=None, series=None,
+                        tamano_bloque=TAMANO_BLOQUE):
+    monotona = intensidad is None
+    if intensidad is None:
+        intensidad = intensidad_kramers
+    heap = []  # (intensidad, ni, nf), el mínimo arriba
+    if k <= 0:
+        # Sin líneas pedidas: el mismo par (bloque, intensidades), vacío
+        vacio = np.array([], dtype=np.int64)
+        return _bloque(vacio, vacio, Z), np.array([], dtype=np.float64)
+
+    for nf, (ni_min, ni_max) in _series(n_max, Z, lmin, lmax, series):
+        if monotona:
+            if len(heap) == k and float(intensidad(ni_min, nf, Z)) <= heap[0][0]:
+                # Ni la mejor línea de esta serie entra; las siguientes son más débiles
+                if float(intensidad(nf + 2, nf + 1, Z)) <= heap[0][0]:
+                    break
+                continue
+            bloques = [np.arange(ni_min, min(ni_max, ni_min + k - 1) + 1, dtype=np.int64)]
+        else:
+            bloques = (b['inicial'] for b in transiciones_rydberg(
+                n_max, Z, lmin, lmax, [nf], tamano_bloque))
+
+        for ni in bloques:
+            valores = intensidad(ni, nf, Z)
+            if len(heap) == k:
+                mejores = valores > heap[0][0]
+                ni, valores = ni[mejores], valores[mejores]
+            if len(valores) > k:
+                top = np.argpartition(valores, -k)[-k:]
+                ni, valores = ni[top], valores[top]
+            for v, n in zip(valores.tolist(), ni.tolist()):
+                if len(heap) < k:
+                    heapq.heappush(heap, (v, n, nf))
+                elif v > heap[0][0]:
+                    heapq.heapreplace(heap, (v, n, nf))
+
+    heap.sort(reverse=True)
+    ni = np.array([h[1] for h in heap], dtype=np.int64)
+    nf = np.array([h[2] for h in heap], dtype=np.int64)
+    return _bloque(ni, nf, Z), np.array([h[0] for h in heap], dtype=np.float64)
+
+# Etiquetas de las primeras líneas de cada serie presentes en los datos:
+# {longitud de onda: 'H$\alpha$ (n=3→2)'}; a lo sumo `maximo_por_serie` por serie
+def etiquetas_series(transiciones, lmin=None, lmax=None, maximo_por_serie=4):
+    transiciones = np.asarray(transiciones)
+    wl = transiciones['longitud_onda_nm']
+    orden_en_serie = transiciones['inicial'] - transiciones['final']
+    mascara = ((orden_en_serie >= 1) & (orden_en_serie <= min(maximo_por_serie, len(LETRAS_GRIEGAS)))
+               & np.isin(transiciones['final'], list(SIMBOLOS_SERIE)))
+    if lmin is not None:
+        mascara &= wl > lmin
+    if lmax is not None:
+        mascara &= wl < lmax
+    etiquetas = {}
+    for ni, nf, w in zip(transiciones['inicial'][mascara].tolist(),
+                         transiciones['final'][mascara].tolist(), wl[mascara].tolist()):
+        griega = LETRAS_GRIEGAS[ni - nf - 1]
+        etiquetas[w] = f"{SIMBOLOS_SERIE[nf]}$\\{griega}$ (n={ni}→{nf})"
+    return dict(sorted(etiquetas.items()))
+
+
+# Programa principal: chequeo contra la matriz completa y ejemplo con n = 10⁵
+if __name__ == "__main__":
+    from simulador_espectro import calcular_transiciones_arrays
+
+    n_max, Z = 300, 2
+    niveles, energias = niveles_rydberg(n_max, Z)
+    completas = calcular_transiciones_arrays(energias, niveles)
+    ventana = (20.0, 400.0)
+    generadas = np.concatenate(list(transiciones_rydberg(n_max, Z, *ventana)))
+    wl_exacta = longitud_onda_nm(completas['inicial'], completas['final'], Z)
+    esperadas = (wl_exacta >= ventana[0]) & (wl_exacta <= ventana[1])
+    assert len(generadas) == esperadas.sum()
+    assert set(zip(generadas['inicial'].tolist(), generadas['final'].tolist())) == \
+        set(zip(completas['inicial'][esperadas].tolist(), completas['final'][esperadas].tolist()))
+    for nf in np.unique(generadas['final']):
+        assert np.all(np.diff(generadas['longitud_onda_nm'][generadas['final'] == nf]) > 0)
+
+    k = 25
+    top, valores = lineas_mas_intensas(k, n_max, Z, *ventana)
+    todas = intensidad_kramers(completas['inicial'][esperadas], completas['final'][esperadas], Z)
+    assert np.allclose(valores, np.sort(todas)[::-1][:k])
+    _, valores_generico = lineas_mas_intensas(k, n_max, Z, *ventana,
+                                              intensidad=lambda ni, nf, Z: intensidad_kramers(ni, nf, Z))
+    assert np.allclose(valores, valores_generico)
+    for k_vacio in (0, -3):
+        top_vacio, valores_vacio = lineas_mas_intensas(k_vacio, n_max, Z, *ventana)
+        assert len(top_vacio) == 0 and len(valores_vacio) == 0
+    print(f"Chequeo con n_max={n_max}, Z={Z}: {len(generadas)} líneas en {ventana} nm, top-{k} OK")
+
+    top, valores = lineas_mas_intensas(10, 100_000, 1, 380, 750)
+    print("Hidrógeno, n ≤ 10⁵, visible: 10 líneas más intensas")
+    for t, v in zip(top.tolist(), valores.tolist()):
+        print(f"  {t[0]:>6} → {t[1]}  {t[3]:8.2f} nm  {v:.3e}")
+    print(etiquetas_series(top, 380, 750))
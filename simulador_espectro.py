@@ -1,11 +1,24 @@
+import argparse
 import numpy as np
-import matplotlib.pyplot as plt
 import csv
+import itertools
 import os
-from matplotlib.collections import LineCollection
+import sys
+
+# Crear el archivo CSV si no existe.
+# Sin n_max se escriben los 7 niveles de siempre; con n_max, los niveles
+# n = 1..n_max del ion hidrogenoide de carga Z según la fórmula de Rydberg.
+def crear_csv_hidrogeno(archivo, n_max=None, Z=1):
+    if n_max is not None:
+        from rydberg import niveles_rydberg
+        niveles, energias = niveles_rydberg(n_max, Z)
+        capas = 'KLMNOPQ'
+        with open(archivo, 'w', newline='') as f:
+            f.write('nivel_principal,energia,symbol\r\n')
+            f.write(''.join(f"{n},{e!r},{capas[n - 1] if n <= len(capas) else ''}\r\n"
+                            for n, e in zip(niveles.tolist(), energias.tolist())))
+        return
 
-# Crear el archivo CSV si no existe
-def crear_csv_hidrogeno(archivo):
     datos = [
         {'nivel_principal': 1, 'energia': -13.60, 'symbol': 'K'},
         {'nivel_principal': 2, 'energia': -3.40, 'symbol': 'L'},
@@ -22,37 +35,367 @@ def crear_csv_hidrogeno(archivo):
         writer.writeheader()
         writer.writerows(datos)
 
+# Leer niveles de energía por bloques, como arreglos tipados (modo generador).
+# Cada bloque son `tamano_bloque` filas parseadas directamente a NumPy,
+# así la memoria máxima no depende del tamaño del archivo.
+def iterar_bloques_niveles(archivo_csv, tamano_bloque=100_000):
+    with open(archivo_csv, 'r', newline='') as f:
+        primera = f.readline()
+        if not primera.strip():
+            return  # archivo o cabecera vacíos: sin niveles, como con DictReader
+        cabecera = next(csv.reader([primera]))
+        tipos = np.dtype([('nivel_principal', np.int64), ('energia', np.float64)])
+        while True:
+            lineas = list(itertools.islice(f, tamano_bloque))
+            if not lineas:
+                break
+            columnas = (cabecera.index('nivel_principal'), cabecera.index('energia'))
+            bloque = np.loadtxt(lineas, delimiter=',', usecols=columnas, dtype=tipos,
+                                quotechar='"', ndmin=1)
+            if len(bloque):
+                yield bloque['nivel_principal'], bloque['energia']
+
+# Leer todos los niveles como dos arreglos (números de nivel, energías)
+def leer_niveles_arrays(archivo_csv, tamano_bloque=100_000):
+    bloques = list(iterar_bloques_niveles(archivo_csv, tamano_bloque))
+    if not bloques:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+    niveles = np.concatenate([b[0] for b in bloques])
+    energias = np.concatenate([b[1] for b in bloques])
+    return niveles, energias
+
+# Quitar niveles repetidos con la semántica del dict de leer_niveles_energia:
+# cada número queda en la posición de su primera aparición, con su última energía
+def niveles_sin_repetir(niveles, energias):
+    niveles = np.asarray(niveles, dtype=np.int64)
+    energias = np.asarray(energias, dtype=np.float64)
+    unicos, primera, inversa = np.unique(niveles, return_index=True, return_inverse=True)
+    if len(unicos) == len(niveles):
+        return niveles, energias
+    ultima = np.zeros(len(unicos), dtype=np.int64)
+    np.maximum.at(ultima, inversa, np.arange(len(niveles)))
+    posiciones = np.sort(primera)
+    return niveles[posiciones], energias[ultima[inversa[posiciones]]]
+
 # Leer niveles de energía desde CSV
 def leer_niveles_energia(archivo_csv):
-    niveles = {}
-    with open(archivo_csv, 'r') as f:
-        reader = csv.DictReader(f)
-        for fila in reader:
-            nivel = int(fila['nivel_principal'])
-            energia = float(fila['energia'])
-            niveles[nivel] = energia
-    return niveles
+    niveles, energias = leer_niveles_arrays(archivo_csv)
+    return dict(zip(niveles.tolist(), energias.tolist()))
+
+# Tipo estructurado de una transición (mismas columnas que el CSV de salida)
+DTYPE_TRANSICION = np.dtype([
+    ('inicial', np.int64),
+    ('final', np.int64),
+    ('energia_eV', np.float64),
+    ('longitud_onda_nm', np.float64)
+])
+
+# Calcular todas las transiciones de una vez con NumPy
+def calcular_transiciones_arrays(energias, niveles=None):
+    energias = np.asarray(energias, dtype=np.float64)
+    if niveles is None:
+        niveles = np.arange(1, len(energias) + 1)
+    niveles = np.asarray(niveles, dtype=np.int64)
+
+    # Máscara de pares (ni > nf): solo transiciones a niveles inferiores.
+    # np.nonzero recorre la máscara por filas, así que el orden coincide
+    # con el doble bucle original.
+    mascara = niveles[:, None] > niveles[None, :]
+    idx_i, idx_f = np.nonzero(mascara)
+    return transiciones_de_pares(niveles[idx_i], energias[idx_i],
+                                 niveles[idx_f], energias[idx_f])
+
+# Armar las transiciones de pares ya elegidos (nivel inicial → nivel final).
+# Los valores quedan sin redondear; el redondeo es cosa de la vista de dicts.
+def transiciones_de_pares(niveles_i, energias_i, niveles_f, energias_f):
+    delta_e = np.abs(np.asarray(energias_f, dtype=np.float64) - np.asarray(energias_i))
+    if np.any(delta_e == 0):
+        # Niveles degenerados: igual que el bucle original, sin λ infinitas
+        raise ZeroDivisionError("float division by zero")
+    longitud_onda = 1240 / delta_e  # en nm (E = hc/λ)
+
+    transiciones = np.empty(len(delta_e), dtype=DTYPE_TRANSICION)
+    transiciones['inicial'] = niveles_i
+    transiciones['final'] = niveles_f
+    transiciones['energia_eV'] = delta_e
+    transiciones['longitud_onda_nm'] = longitud_onda
+    return transiciones
+
+# Convertir el arreglo estructurado a la lista de diccionarios de siempre,
+# redondeada con round() de Python (np.round no redondea igual: 10.205 → 10.2)
+def transiciones_a_dicts(transiciones):
+    return [{'inicial': i, 'final': f, 'energia_eV': round(e, 2), 'longitud_onda_nm': round(wl, 1)}
+            for i, f, e, wl in transiciones[list(DTYPE_TRANSICION.names)].tolist()]
+
+# Redondear como round() de Python, pero vectorizado. np.round elige otro
+# entero cuando x·10ⁿ queda a un error de redondeo de ,5 (10.205 → 10.2);
+# esos casos dudosos, muy pocos, se resuelven con round() y el resto con
+# np.round, que fuera de ellos da exactamente el mismo flotante.
+def redondear_como_python(valores, decimales):
+    valores = np.asarray(valores, dtype=np.float64)
+    resultado = np.round(valores, decimales)
+    escalados = valores * 10.0 ** decimales
+    dudosos = np.nonzero(np.abs(escalados - np.floor(escalados) - 0.5)
+                         <= 1e-9 * np.maximum(1, np.abs(escalados)))[0]
+    resultado[dudosos] = [round(v, decimales) for v in valores[dudosos].tolist()]
+    return resultado
+
+# Copia del arreglo con los mismos valores que la vista de dicts
+def redondear_transiciones(transiciones):
+    redondeadas = transiciones_a_arreglo(transiciones).copy()
+    redondeadas['energia_eV'] = redondear_como_python(redondeadas['energia_eV'], 2)
+    redondeadas['longitud_onda_nm'] = redondear_como_python(redondeadas['longitud_onda_nm'], 1)
+    return redondeadas
+
+# Convertir una lista de diccionarios (o un arreglo) al arreglo estructurado
+def transiciones_a_arreglo(transiciones):
+    if isinstance(transiciones, np.ndarray):
+        return transiciones.astype(DTYPE_TRANSICION, copy=False)
+    campos = DTYPE_TRANSICION.names
+    filas = [tuple(t[c] for c in campos) for t in transiciones]
+    return np.array(filas, dtype=DTYPE_TRANSICION)
 
 # Calcular todas las transiciones posibles
 def calcular_transiciones(niveles):
-    transiciones = []
-    for ni in niveles:
-        for nf in niveles:
-            if ni > nf:  # Solo transiciones a niveles inferiores
-                delta_e = abs(niveles[nf] - niveles[ni])
-                longitud_onda = 1240 / delta_e  # en nm (E = hc/λ)
-                transiciones.append({
-                    'inicial': ni,
-                    'final': nf,
-                    'energia_eV': round(delta_e, 2),
-                    'longitud_onda_nm': round(longitud_onda, 1)
-                })
-    return transiciones
+    energias = np.fromiter(niveles.values(), dtype=np.float64, count=len(niveles))
+    numeros = np.fromiter(niveles.keys(), dtype=np.int64, count=len(niveles))
+    return transiciones_a_dicts(calcular_transiciones_arrays(energias, numeros))
+
+# Rango visible (nm), con bordes excluidos
+RANGO_VISIBLE = (380, 750)
+
+# Fracción de filas agregadas o borradas (sobre las del tramo principal) a
+# partir de la cual IndiceTransiciones funde sus tramos en uno solo
+FRACCION_COMPACTAR = 0.125
+
+# Tramo de un IndiceTransiciones: filas ordenadas por longitud de onda que no
+# se mueven nunca; borrar una fila es marcarla como muerta. Las posiciones de
+# cada nivel y el orden por energía se arman la primera vez que hacen falta.
+class _TramoTransiciones:
+    def __init__(self, filas):
+        self.filas = filas
+        self.longitudes = filas['longitud_onda_nm']
+        self.vivas = None  # None: todas vivas
+        self.muertas = 0
+        self._por_nivel = None  # (niveles ordenados, fila de cada uno)
+        self._orden_energia = None
+        self._energias = None
+
+    def __len__(self):
+        return len(self.filas) - self.muertas
+
+    def _solo_vivas(self, posiciones):
+        return posiciones if self.vivas is None else posiciones[self.vivas[posiciones]]
+
+    def ventana(self, lmin, lmax, incluir_bordes):
+        izq, der = ('left', 'right') if incluir_bordes else ('right', 'left')
+        i = np.searchsorted(self.longitudes, lmin, side=izq)
+        j = np.searchsorted(self.longitudes, lmax, side=der)
+        if self.vivas is None:
+            return self.filas[i:j]
+        return self.filas[i:j][self.vivas[i:j]]
+
+    def orden_energia(self):
+        if self._orden_energia is None:
+            self._orden_energia = np.argsort(self.filas['energia_eV'], kind='stable')
+            self._energias = self.filas['energia_eV'][self._orden_energia]
+        return self._orden_energia
+
+    # Posiciones (vivas, ordenadas por energía) con emin <= energía <= emax
+    def rango_energia(self, emin, emax):
+        orden = self.orden_energia()
+        i = np.searchsorted(self._energias, emin, side='left')
+        j = np.searchsorted(self._energias, emax, side='right')
+        return self._solo_vivas(orden[i:j])
+
+    # Posiciones de las filas vivas en que aparece `nivel` (como inicial o final)
+    def posiciones_nivel(self, nivel):
+        if self._por_nivel is None:
+            niveles = np.concatenate([self.filas['inicial'], self.filas['final']])
+            orden = np.argsort(niveles, kind='stable')
+            self._por_nivel = (niveles[orden], np.tile(np.arange(len(self.filas)), 2)[orden])
+        niveles, posiciones = self._por_nivel
+        i = np.searchsorted(niveles, nivel, side='left')
+        j = np.searchsorted(niveles, nivel, side='right')
+        return self._solo_vivas(posiciones[i:j])
+
+    # Marcar filas como borradas; devuelve una copia de ellas
+    def borrar(self, posiciones):
+        if self.vivas is None:
+            self.vivas = np.ones(len(self.filas), dtype=bool)
+        self.vivas[posiciones] = False
+        self.muertas += len(posiciones)
+        return self.filas[posiciones]
+
+    def filas_vivas(self):
+        return self.filas if self.vivas is None else self.filas[self.vivas]
+
+# Índice de transiciones ordenado por longitud de onda.
+# Una consulta de ventana es una búsqueda binaria más un corte (vista, sin copia)
+# y las ventanas ya consultadas se guardan para no repetir el trabajo.
+# Para editar por niveles el índice admite cambios sin copiar todo el arreglo:
+# borrar un nivel marca sus N-1 filas como muertas (ubicadas por búsqueda
+# binaria) e insertar agrega un tramo ordenado aparte. Las consultas recorren
+# los pocos tramos y unen los resultados; cuando lo agregado o borrado pasa
+# de FRACCION_COMPACTAR del total, los tramos se funden en uno (costo
+# amortizado O(N) por nivel editado). El orden por energía de cada tramo se
+# conserva entre cambios.
+class IndiceTransiciones:
+    def __init__(self, transiciones, ya_ordenado=False, niveles=None):
+        transiciones = transiciones_a_arreglo(transiciones)
+        self.niveles = None if niveles is None else np.asarray(niveles, dtype=np.int64)
+        if not ya_ordenado:
+            orden = np.argsort(transiciones['longitud_onda_nm'], kind='stable')
+            transiciones = transiciones[orden]
+        self._tramos = [_TramoTransiciones(transiciones)]
+        self._ventanas = {}
+        self._rangos_energia = {}
+
+    # Todas las transiciones vivas, ordenadas por longitud de onda
+    # (si hubo cambios, primero se funden los tramos)
+    @property
+    def transiciones(self):
+        self._compactar()
+        return self._tramos[0].filas
+
+    @property
+    def longitudes(self):
+        self._compactar()
+        return self._tramos[0].longitudes
+
+    def __len__(self):
+        return sum(len(t) for t in self._tramos)
+
+    # Transiciones con λmin < λ < λmax (o λmin <= λ <= λmax si incluir_bordes)
+    def ventana(self, lmin, lmax, incluir_bordes=False):
+        clave = (lmin, lmax, incluir_bordes)
+        if clave not in self._ventanas:
+            partes = [t.ventana(lmin, lmax, incluir_bordes) for t in self._tramos]
+            self._ventanas[clave] = _unir_ordenadas(partes, 'longitud_onda_nm')
+        return self._ventanas[clave]
+
+    def visibles(self):
+        return self.ventana(*RANGO_VISIBLE)
+
+    # Filas en el orden del doble bucle de calcular_transiciones: por nivel
+    # inicial y dentro por nivel final, en el orden de `niveles` (el del CSV).
+    # Sin niveles se asume que el CSV los lista en orden creciente.
+    def en_orden_de_pares(self, filas):
+        if self.niveles is None:
+            return filas[np.lexsort((filas['final'], filas['inicial']))]
+        orden_niveles = np.argsort(self.niveles, kind='stable')
+
+        def posicion(n):
+            return orden_niveles[np.searchsorted(self.niveles, n, sorter=orden_niveles)]
+        return filas[np.lexsort((posicion(filas['final']), posicion(filas['inicial'])))]
+
+    # Quitar todas las filas en que aparece `nivel`; devuelve las filas quitadas
+    def eliminar_nivel(self, nivel):
+        quitadas = np.concatenate([t.borrar(t.posiciones_nivel(nivel)) for t in self._tramos])
+        self._invalidar(quitadas)
+        self._compactar_si_conviene()
+        return quitadas
+
+    # Insertar filas nuevas como un tramo ordenado aparte (sin tocar las demás)
+    def insertar(self, nuevas):
+        nuevas = transiciones_a_arreglo(nuevas)
+        if len(nuevas):
+            nuevas = nuevas[np.argsort(nuevas['longitud_onda_nm'], kind='stable')]
+            self._tramos.append(_TramoTransiciones(nuevas))
+        self._invalidar(nuevas)
+        self._compactar_si_conviene()
+
+    def _compactar_si_conviene(self):
+        cambios = (sum(len(t.filas) for t in self._tramos[1:])
+                   + sum(t.muertas for t in self._tramos))
+        if cambios > FRACCION_COMPACTAR * len(self._tramos[0].filas):
+            self._compactar()
+
+    # Fundir los tramos en uno sin filas muertas. Como cada tramo ya está
+    # ordenado, el sort estable solo mezcla corridas; el orden por energía
+    # se arma igual a partir de los órdenes que ya tenía cada tramo.
+    def _compactar(self):
+        if len(self._tramos) == 1 and not self._tramos[0].muertas:
+            return
+        vivas = [t.filas_vivas() for t in self._tramos]
+        filas = np.concatenate(vivas)
+        orden = np.argsort(filas['longitud_onda_nm'], kind='stable')
+        tramo = _TramoTransiciones(filas[orden])
+
+        if any(t._orden_energia is not None for t in self._tramos):
+            # Posición final de cada fila viva de cada tramo
+            nueva_posicion = np.empty(len(filas), dtype=np.int64)
+            nueva_posicion[orden] = np.arange(len(filas))
+            corridas, desplazamiento = [], 0
+            for t, v in zip(self._tramos, vivas):
+                rango = t.orden_energia() if t.vivas is None else t.rango_energia(-np.inf, np.inf)
+                if t.vivas is not None:
+                    # Índice de cada fila viva dentro de filas_vivas()
+                    rango = (np.cumsum(t.vivas) - 1)[rango]
+                corridas.append(nueva_posicion[rango + desplazamiento])
+                desplazamiento += len(v)
+            candidatos = np.concatenate(corridas)
+            energias = tramo.filas['energia_eV']
+            tramo._orden_energia = candidatos[np.argsort(energias[candidatos], kind='stable')]
+            tramo._energias = energias[tramo._orden_energia]
+        self._tramos = [tramo]
+
+    # Olvidar solo las consultas guardadas que contienen alguna de las filas cambiadas.
+    # Las demás siguen siendo válidas: apuntan a datos que no cambiaron.
+    def _invalidar(self, filas):
+        if not len(filas):
+            return
+        longitudes = np.sort(filas['longitud_onda_nm'])
+        for clave in list(self._ventanas):
+            lmin, lmax, _ = clave
+            i = np.searchsorted(longitudes, lmin, side='left')
+            if i < len(longitudes) and longitudes[i] <= lmax:
+                del self._ventanas[clave]
+        energias = np.sort(filas['energia_eV'])
+        for clave in list(self._rangos_energia):
+            emin, emax = clave
+            i = np.searchsorted(energias, emin, side='left')
+            if i < len(energias) and energias[i] <= emax:
+                del self._rangos_energia[clave]
+
+    # Transiciones con emin <= energía <= emax, ordenadas por energía
+    def rango_energia(self, emin, emax):
+        clave = (emin, emax)
+        if clave not in self._rangos_energia:
+            partes = [t.filas[t.rango_energia(emin, emax)] for t in self._tramos]
+            self._rangos_energia[clave] = _unir_ordenadas(partes, 'energia_eV')
+        return self._rangos_energia[clave]
+
+# Unir partes ya ordenadas por `campo` (con una sola parte, tal cual)
+def _unir_ordenadas(partes, campo):
+    if len(partes) == 1:
+        return partes[0]
+    filas = np.concatenate(partes)
+    return filas[np.argsort(filas[campo], kind='stable')]
+
+# Transiciones visibles de un índice tal como las da la versión con dicts:
+# redondeadas, en el orden de pares de siempre y con el filtro aplicado
+# sobre los valores redondeados (así quedan exactamente las mismas líneas)
+def visibles_redondeadas(indice):
+    visibles = redondear_transiciones(indice.en_orden_de_pares(indice.visibles()))
+    wl = visibles['longitud_onda_nm']
+    return visibles[(wl > RANGO_VISIBLE[0]) & (wl < RANGO_VISIBLE[1])]
 
 # Generar espectro de líneas
-def generar_espectro(transiciones, archivo_salida):
-    # Filtrar solo el rango visible
-    visibles = [t for t in transiciones if 380 < t['longitud_onda_nm'] < 750]
+# (mostrar=False: modo no interactivo, guarda la imagen y cierra la figura)
+def generar_espectro(transiciones, archivo_salida, mostrar=True):
+    # matplotlib se carga solo al graficar (los comandos de cálculo no lo necesitan)
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+
+    # Filtrar solo el rango visible (con un índice, la ventana ya está resuelta)
+    if isinstance(transiciones, IndiceTransiciones):
+        transiciones = visibles_redondeadas(transiciones)
+    if isinstance(transiciones, np.ndarray):
+        wl = transiciones['longitud_onda_nm']
+        visibles = transiciones_a_dicts(transiciones[(wl > 380) & (wl < 750)])
+    else:
+        visibles = [t for t in transiciones if 380 < t['longitud_onda_nm'] < 750]
     
     # Configurar gráfico
     fig, ax = plt.subplots(figsize=(12, 6))
@@ -80,15 +423,9 @@ def generar_espectro(transiciones, archivo_salida):
     ax.set_ylabel('Intensidad relativa', fontsize=12)
     ax.grid(True, alpha=0.3)
     
-    # Anotar transiciones importantes
-    lineas_balmer = {
-        656.3: r'H$\alpha$ (n=3→2)',
-        486.1: r'H$\beta$ (n=4→2)',
-        434.0: r'H$\gamma$ (n=5→2)',
-        410.2: r'H$\delta$ (n=6→2)'
-    }
-    
-    for wl, label in lineas_balmer.items():
+    # Anotar las primeras líneas de cada serie presentes en los datos
+    from rydberg import etiquetas_series
+    for wl, label in etiquetas_series(transiciones_a_arreglo(visibles), *RANGO_VISIBLE).items():
         ax.text(wl, 1.05, label, ha='center', fontsize=9, rotation=90)
     
     # Añadir barra de color
@@ -100,37 +437,184 @@ def generar_espectro(transiciones, archivo_salida):
     
     plt.tight_layout()
     plt.savefig(archivo_salida, dpi=150)
-    plt.show()
+    if mostrar:
+        plt.show()
+    else:
+        plt.close(fig)
     
     return visibles
 
-# Guardar transiciones en CSV
-def guardar_transiciones(transiciones, archivo_salida):
-    with open(archivo_salida, 'w', newline='') as f:
-        campos = ['inicial', 'final', 'energia_eV', 'longitud_onda_nm']
-        writer = csv.DictWriter(f, fieldnames=campos)
-        writer.writeheader()
-        writer.writerows(transiciones)
+# Registro binario compacto de ancho fijo (16 bytes por transición).
+# Guarda niveles como int32 y valores como float32: pierde precisión
+# (~7 cifras significativas) frente a los float64 del cálculo; para
+# conservarlos tal cual usar .npy o .npz.
+DTYPE_REGISTRO_BINARIO = np.dtype([
+    ('inicial', '<i4'),
+    ('final', '<i4'),
+    ('energia_eV', '<f4'),
+    ('longitud_onda_nm', '<f4')
+])
 
-# Programa principal
-if __name__ == "__main__":
+# Escribir el CSV por bloques grandes, sin un dict por fila.
+# El texto es idéntico al de csv.DictWriter (repr de los flotantes, fin de línea \r\n).
+def _escribir_csv_bloques(transiciones, f, tamano_bloque):
+    f.write(','.join(DTYPE_TRANSICION.names) + '\r\n')
+    for inicio in range(0, len(transiciones), tamano_bloque):
+        filas = transiciones[inicio:inicio + tamano_bloque].tolist()
+        f.write(''.join([f'{i},{fi},{e!r},{wl!r}\r\n' for i, fi, e, wl in filas]))
+
+# Guardar transiciones; el formato se deduce de la extensión:
+# .csv, .csv.gz, .npy (arreglo estructurado), .npz (columnas) o .bin (registros
+# fijos f4/i4, con pérdida de precisión). Con el arreglo estructurado se escribe
+# directo; una lista de dicts primero se convierte fila por fila.
+def guardar_transiciones(transiciones, archivo_salida, formato=None, tamano_bloque=65536):
+    transiciones = transiciones_a_arreglo(transiciones)
+    if formato is None:
+        nombre = str(archivo_salida).lower()
+        formato = next((ext for ext in ('csv.gz', 'csv', 'npy', 'npz', 'bin')
+                        if nombre.endswith('.' + ext)), 'csv')
+
+    if formato == 'csv':
+        with open(archivo_salida, 'w', newline='', buffering=1 << 20) as f:
+            _escribir_csv_bloques(transiciones, f, tamano_bloque)
+    elif formato == 'csv.gz':
+        import gzip
+        with gzip.open(archivo_salida, 'wt', newline='', compresslevel=6) as f:
+            _escribir_csv_bloques(transiciones, f, tamano_bloque)
+    elif formato == 'npy':
+        np.save(archivo_salida, transiciones)
+    elif formato == 'npz':
+        np.savez(archivo_salida, **{c: transiciones[c] for c in DTYPE_TRANSICION.names})
+    elif formato == 'bin':
+        with open(archivo_salida, 'wb') as f:
+            for inicio in range(0, len(transiciones), tamano_bloque):
+                bloque = transiciones[inicio:inicio + tamano_bloque]
+                bloque.astype(DTYPE_REGISTRO_BINARIO).tofile(f)
+    else:
+        raise ValueError(f"Formato de salida desconocido: {formato}")
+
+# Leer un archivo .bin escrito por guardar_transiciones
+def leer_transiciones_binario(archivo):
+    return np.fromfile(archivo, dtype=DTYPE_REGISTRO_BINARIO).astype(DTYPE_TRANSICION)
+
+# Pipeline original: crear el CSV si falta, calcular, graficar y guardar visibles
+def pipeline_completo(archivo_csv='niveles_hidrogeno.csv'):
     # Crear archivo CSV si no existe
-    archivo_csv = 'niveles_hidrogeno.csv'
     if not os.path.exists(archivo_csv):
         crear_csv_hidrogeno(archivo_csv)
         print(f"Archivo {archivo_csv} creado exitosamente!")
     
-    # 1. Leer datos desde CSV
-    niveles = leer_niveles_energia(archivo_csv)
+    # 1 y 2. Leer niveles y calcular transiciones (o recuperarlos de la caché)
+    from cache_espectro import CacheEspectro
+    numeros, energias, transiciones = CacheEspectro().cargar(archivo_csv)
+    niveles = dict(zip(numeros.tolist(), energias.tolist()))
     print("Niveles de energía cargados:", niveles)
-    
-    # 2. Calcular transiciones
-    transiciones = calcular_transiciones(niveles)
     print(f"Se calcularon {len(transiciones)} transiciones posibles")
     
-    # 3. Generar espectro y obtener transiciones visibles
-    transiciones_visibles = generar_espectro(transiciones, 'espectro_hidrogeno.png')
+    # 3. Generar espectro con las transiciones visibles (arreglo ya redondeado,
+    # que se guarda sin pasar por dicts)
+    indice = IndiceTransiciones(transiciones, ya_ordenado=True, niveles=numeros)
+    transiciones_visibles = visibles_redondeadas(indice)
+    generar_espectro(transiciones_visibles, 'espectro_hidrogeno.png')
     
     # 4. Guardar resultados
     guardar_transiciones(transiciones_visibles, 'transiciones_visibles.csv')
-    print("Resultados guardados en 'transiciones_visibles.csv'")
\ No newline at end of file
+    print("Resultados guardados en 'transiciones_visibles.csv'")
+
+# Transiciones del CSV (por la caché salvo --sin-cache), filtradas por rango.
+# --visibles da lo mismo que transiciones_visibles.csv del pipeline completo
+def _transiciones_cli(args):
+    if not os.path.exists(args.csv):
+        crear_csv_hidrogeno(args.csv)
+    if args.sin_cache:
+        numeros, energias = niveles_sin_repetir(*leer_niveles_arrays(args.csv))
+        indice = IndiceTransiciones(calcular_transiciones_arrays(energias, numeros),
+                                    niveles=numeros)
+    else:
+        from cache_espectro import CacheEspectro
+        numeros, _, transiciones = CacheEspectro().cargar(args.csv)
+        indice = IndiceTransiciones(transiciones, ya_ordenado=True, niveles=numeros)
+    if args.visibles:
+        return visibles_redondeadas(indice)
+    if args.rango:
+        return indice.ventana(*args.rango)
+    return indice.transiciones
+
+def _cmd_levels(args):
+    if not os.path.exists(args.csv):
+        crear_csv_hidrogeno(args.csv)
+    numeros, energias = leer_niveles_arrays(args.csv)
+    sys.stdout.write(''.join(f'{n}\t{e!r}\n' for n, e in zip(numeros.tolist(), energias.tolist())))
+
+def _cmd_transitions(args):
+    transiciones = _transiciones_cli(args)
+    if args.salida:
+        guardar_transiciones(transiciones, args.salida)
+        print(f"{len(transiciones)} transiciones guardadas en '{args.salida}'")
+    else:
+        _escribir_csv_bloques(transiciones_a_arreglo(transiciones), sys.stdout, 65536)
+
+def _cmd_render(args):
+    args.visibles, args.rango = True, None
+    visibles = _transiciones_cli(args)
+    if args.mostrar:
+        generar_espectro(visibles, args.salida, mostrar=True)
+    else:
+        from render_espectro import RenderizadorEspectro
+        renderizador = RenderizadorEspectro()
+        renderizador.renderizar(visibles, args.salida)
+        renderizador.cerrar()
+    print(f"Espectro ({len(visibles)} líneas visibles) guardado en '{args.salida}'")
+
+def _cmd_export(args):
+    transiciones = _transiciones_cli(args)
+    guardar_transiciones(transiciones, args.salida, formato=args.formato)
+    print(f"{len(transiciones)} transiciones exportadas a '{args.salida}'")
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Simulador de espectros atómicos (sin argumentos: pipeline completo)")
+    sub = parser.add_subparsers(dest='comando')
+
+    def comando(nombre, alias, ayuda, funcion):
+        p = sub.add_parser(nombre, aliases=[alias], help=ayuda)
+        p.add_argument('csv', nargs='?', default='niveles_hidrogeno.csv',
+                       help="CSV de niveles (se crea el del hidrógeno si no existe)")
+        p.set_defaults(funcion=funcion)
+        return p
+
+    def filtros(p):
+        rango = p.add_mutually_exclusive_group()
+        rango.add_argument('--visibles', action='store_true',
+                           help="Solo el rango visible, como transiciones_visibles.csv")
+        rango.add_argument('--rango', type=float, nargs=2, metavar=('MIN', 'MAX'),
+                           help="Solo longitudes de onda en [MIN, MAX] nm")
+        p.add_argument('--sin-cache', action='store_true', help="Calcular sin usar la caché")
+
+    comando('levels', 'niveles', "Listar niveles de energía", _cmd_levels)
+    p = comando('transitions', 'transiciones', "Calcular transiciones (CSV a stdout o -o)",
+                _cmd_transitions)
+    filtros(p)
+    p.add_argument('-o', '--salida', default=None, help="Archivo de salida (formato por extensión)")
+    p = comando('render', 'graficar', "Graficar el espectro visible", _cmd_render)
+    p.add_argument('-o', '--salida', default='espectro_hidrogeno.png')
+    p.add_argument('--mostrar', action='store_true', help="Abrir la ventana de matplotlib")
+    p.add_argument('--sin-cache', action='store_true', help="Calcular sin usar la caché")
+    p = comando('export', 'exportar', "Exportar transiciones a csv, csv.gz, npy, npz o bin",
+                _cmd_export)
+    filtros(p)
+    p.add_argument('-o', '--salida', required=True)
+    p.add_argument('--formato', default=None, choices=['csv', 'csv.gz', 'npy', 'npz', 'bin'])
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando is None:
+        pipeline_completo()
+    else:
+        args.funcion(args)
+
+
+# Programa principal
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import numpy as np
+from cache_espectro import CacheEspectro
+from simulador_espectro import (calcular_transiciones_arrays, leer_niveles_energia,
+                                niveles_sin_repetir, transiciones_a_dicts)
+
+# La caché tiene que dar las mismas transiciones que el camino de dicts,
+# también con niveles repetidos en el CSV (gana la última energía)
+
+
+def escribir_csv(ruta, filas):
+    with open(ruta, 'w') as f:
+        f.write('nivel_principal,energia\n')
+        f.writelines(f'{n},{e!r}\n' for n, e in filas)
+
+def test_niveles_repetidos_como_dict(tmp_path):
+    archivo = tmp_path / 'niveles.csv'
+    filas = [(1, -13.6), (2, -3.4), (3, -1.0), (4, -0.85), (3, -1.51), (5, -0.544), (6, -0.378)]
+    escribir_csv(archivo, filas)
+    esperados = leer_niveles_energia(archivo)
+
+    niveles, energias, transiciones = CacheEspectro(tmp_path / 'cache').cargar(archivo)
+    assert dict(zip(niveles.tolist(), energias.tolist())) == esperados
+    assert niveles.tolist() == list(esperados)
+    assert len(transiciones) == 15
+
+    directas = calcular_transiciones_arrays(np.array(list(esperados.values())),
+                                            np.array(list(esperados.keys())))
+    def claves(t):
+        return sorted((d['inicial'], d['final'], d['energia_eV'], d['longitud_onda_nm'])
+                      for d in transiciones_a_dicts(t))
+    assert claves(transiciones) == claves(directas)
+    assert (3, 2, 1.89, 656.1) in claves(transiciones)
+    assert (3, 2, 2.4, 516.7) not in claves(transiciones)
+
+def test_niveles_sin_repetir():
+    rng = np.random.default_rng(0)
+    niveles = rng.integers(1, 30, 200)
+    energias = rng.uniform(-14, -0.1, 200)
+    esperados = dict(zip(niveles.tolist(), energias.tolist()))
+    unicos, ultimas = niveles_sin_repetir(niveles, energias)
+    assert unicos.tolist() == list(esperados)
+    assert ultimas.tolist() == list(esperados.values())
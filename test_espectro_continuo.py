@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from espectro_continuo import PERFILES, espectro_continuo, rejilla_longitudes
+from simulador_espectro import DTYPE_TRANSICION
+
+# Los dos métodos tienen que dar el mismo espectro, también con líneas cuyo
+# centro cae fuera de la rejilla pero cuyas colas entran
+
+
+def transiciones(centros, rng):
+    t = np.zeros(len(centros), dtype=DTYPE_TRANSICION)
+    t['longitud_onda_nm'] = centros
+    t['energia_eV'] = rng.uniform(1, 3, len(centros))
+    return t
+
+@pytest.mark.parametrize('perfil', PERFILES)
+def test_linea_fuera_de_la_rejilla(perfil):
+    t = transiciones([379.0, 401.5], np.random.default_rng(0))
+    rejilla = rejilla_longitudes(380, 400, 41)
+    directo = espectro_continuo(t, rejilla, perfil, ancho=2, metodo='directo')
+    fft = espectro_continuo(t, rejilla, perfil, ancho=2, metodo='fft')
+    assert directo[0] > 0 and directo[-1] > 0
+    assert np.allclose(fft, directo, rtol=1e-9, atol=1e-12)
+
+@pytest.mark.parametrize('perfil', PERFILES)
+def test_directo_y_fft_con_ancho_unico(perfil):
+    rng = np.random.default_rng(1)
+    # Centros sobre puntos de la rejilla (paso 0,01 nm), incluidos los de afuera
+    t = transiciones(np.round(rng.uniform(370, 760, 2000), 2), rng)
+    rejilla = rejilla_longitudes(380, 750, 37_001)
+    directo = espectro_continuo(t, rejilla, perfil, ancho=0.4373, metodo='directo')
+    fft = espectro_continuo(t, rejilla, perfil, ancho=0.4373, metodo='fft')
+    assert np.allclose(fft, directo, rtol=1e-9, atol=1e-9 * directo.max())
+    por_linea = espectro_continuo(t, rejilla, perfil, ancho=np.full(len(t), 0.4373), metodo='fft')
+    assert np.allclose(por_linea, fft, rtol=1e-9, atol=1e-9 * directo.max())
+
+@pytest.mark.parametrize('perfil', PERFILES)
+def test_directo_y_fft_con_anchos_por_linea(perfil):
+    rng = np.random.default_rng(2)
+    t = transiciones(np.round(rng.uniform(370, 760, 500), 2), rng)
+    anchos = rng.uniform(0.2, 0.9, len(t))
+    rejilla = rejilla_longitudes(380, 750, 37_001)
+    # Ventana amplia: quedan la interpolación entre nodos (< 1e-6 del pico) y
+    # la cola lorentziana cortada a la ventana de la clase
+    directo = espectro_continuo(t, rejilla, perfil, ancho=anchos, truncar=300, metodo='directo')
+    fft = espectro_continuo(t, rejilla, perfil, ancho=anchos, truncar=300, metodo='fft')
+    assert np.abs(fft - directo).max() < 1e-4 * directo.max()
+
+def test_auto_usa_fft_con_anchos_por_linea():
+    rng = np.random.default_rng(3)
+    t = transiciones(rng.uniform(380, 750, 20_000), rng)
+    rejilla = rejilla_longitudes(380, 750, 200_000)
+    anchos = np.full(len(t), 0.5)  # un arreglo por línea, con un solo valor
+    auto = espectro_continuo(t, rejilla, 'gaussiano', ancho=anchos)
+    fft = espectro_continuo(t, rejilla, 'gaussiano', ancho=anchos, metodo='fft')
+    assert np.array_equal(auto, fft)
+
+def test_errores():
+    t = transiciones([500.0], np.random.default_rng(4))
+    with pytest.raises(ValueError):
+        espectro_continuo(t, rejilla_longitudes(), 'cuadrado')
+    with pytest.raises(ValueError):
+        espectro_continuo(t, np.array([400.0, 401.0, 403.0]), metodo='fft')
+    with pytest.raises(ValueError):
+        espectro_continuo(t, rejilla_longitudes(), ancho=0)
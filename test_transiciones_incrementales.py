@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from simulador_espectro import IndiceTransiciones, calcular_transiciones_arrays
+from transiciones_incrementales import TransicionesIncrementales
+
+# Las operaciones delta tienen que dar lo mismo que recalcular todo
+
+
+def claves(t):
+    return t[np.lexsort((t['final'], t['inicial']))].tolist()
+
+def recalculo(niveles):
+    return IndiceTransiciones(calcular_transiciones_arrays(
+        np.array(list(niveles.values())), np.array(list(niveles.keys()))))
+
+@pytest.mark.parametrize('semilla', [0, 1, 2])
+def test_operaciones_equivalen_a_recalcular(semilla):
+    rng = np.random.default_rng(semilla)
+    niveles = {n: -13.6 / n ** 2 for n in range(1, 40)}
+    incremental = TransicionesIncrementales(niveles)
+    for paso in range(300):
+        operacion = rng.choice(['agregar', 'eliminar', 'modificar'])
+        nivel = int(rng.integers(1, 80))
+        energia = -13.6 / rng.uniform(1, 80) ** 2
+        if operacion == 'agregar' and nivel not in niveles:
+            incremental.agregar_nivel(nivel, energia)
+            niveles[nivel] = energia
+        elif operacion == 'eliminar' and nivel in niveles and len(niveles) > 2:
+            incremental.eliminar_nivel(nivel)
+            del niveles[nivel]
+        elif operacion == 'modificar' and nivel in niveles:
+            incremental.modificar_nivel(nivel, energia)
+            niveles[nivel] = energia
+
+        completo = recalculo(niveles)
+        # Consultas sin compactar primero (recorren los tramos) ...
+        assert len(incremental.indice) == len(completo), paso
+        assert claves(incremental.visibles()) == claves(completo.visibles()), paso
+        assert claves(incremental.ventana(90, 200)) == claves(completo.ventana(90, 200)), paso
+        rango = incremental.indice.rango_energia(0.5, 2.0)
+        assert claves(rango) == claves(completo.rango_energia(0.5, 2.0)), paso
+        assert np.all(np.diff(rango['energia_eV']) >= 0), paso
+        if paso % 10 == 0:
+            # ... y el arreglo completo, ya fundido
+            assert claves(incremental.transiciones) == claves(completo.transiciones), paso
+            assert np.all(np.diff(incremental.indice.longitudes) >= 0), paso
+
+def test_cambio_de_nivel_no_copia_el_arreglo():
+    incremental = TransicionesIncrementales({n: -13.6 / n ** 2 for n in range(1, 200)})
+    indice = incremental.indice
+    indice.rango_energia(1, 2)
+    principal = indice._tramos[0]
+    filas, orden_energia = principal.filas, principal._orden_energia
+
+    incremental.modificar_nivel(50, -13.6 / 50.5 ** 2)
+    incremental.eliminar_nivel(120)
+    # El tramo principal sigue siendo el mismo arreglo, con su orden por energía;
+    # solo se marcaron las filas de los niveles tocados
+    assert indice._tramos[0].filas is filas
+    assert indice._tramos[0]._orden_energia is orden_energia
+    assert principal.muertas == 198 + 197  # el par (120, 50) ya estaba borrado
+    assert len(indice._tramos) == 2
+    assert len(indice._tramos[1].filas) == 198 and indice._tramos[1].muertas == 1
+
+def test_compactar_conserva_orden_por_energia():
+    niveles = {n: -13.6 / n ** 2 for n in range(1, 60)}
+    incremental = TransicionesIncrementales(niveles)
+    incremental.indice.rango_energia(0, 1)
+    for nivel in range(2, 40):
+        niveles[nivel] = -13.6 / (nivel + 0.3) ** 2
+        incremental.modificar_nivel(nivel, niveles[nivel])
+    indice = incremental.indice
+    assert len(indice._tramos) < 38  # hubo al menos una compactación
+    completo = recalculo(niveles)
+    assert claves(indice.rango_energia(0, 20)) == claves(completo.rango_energia(0, 20))
+    indice.transiciones  # fuerza la compactación final
+    principal = indice._tramos[0]
+    assert np.array_equal(principal._energias, np.sort(principal.filas['energia_eV']))
+
+def test_nivel_inexistente():
+    incremental = TransicionesIncrementales({1: -13.6, 2: -3.4})
+    with pytest.raises(KeyError):
+        incremental.eliminar_nivel(5)
+    with pytest.raises(KeyError):
+        incremental.agregar_nivel(2, -1.0)
+
+@pytest.mark.parametrize('operacion', ['modificar', 'agregar'])
+def test_cambio_rechazado_no_toca_nada(operacion):
+    incremental = TransicionesIncrementales({1: -13.6, 2: -3.4, 3: -1.51})
+    antes = claves(incremental.transiciones)
+    with pytest.raises(ZeroDivisionError):
+        if operacion == 'modificar':
+            incremental.modificar_nivel(3, -3.4)
+        else:
+            incremental.agregar_nivel(4, -3.4)
+    assert incremental.niveles == {1: -13.6, 2: -3.4, 3: -1.51}
+    assert incremental.version == 0
+    assert len(incremental.indice) == 3
+    assert claves(incremental.transiciones) == antes
+
+def test_registro_de_cambios_acotado():
+    import transiciones_incrementales
+    incremental = TransicionesIncrementales({n: -13.6 / n ** 2 for n in range(1, 10)})
+    incremental.marcar_renderizado(100, 300)  # el nivel 9 no tiene líneas acá
+    for paso in range(transiciones_incrementales.MAXIMO_CAMBIOS + 5):
+        if paso == transiciones_incrementales.MAXIMO_CAMBIOS:
+            assert not incremental.necesita_render(100, 300)
+        incremental.modificar_nivel(9, -13.6 / (9 + (paso + 1) / 1000) ** 2)
+    assert len(incremental._cambios) == transiciones_incrementales.MAXIMO_CAMBIOS
+    # Los primeros cambios se olvidaron: la ventana se da por cambiada
+    assert incremental.necesita_render(100, 300)
+    incremental.marcar_renderizado(100, 300)
+    assert not incremental.necesita_render(100, 300)
@@ -0,0 +1,106 @@
+import os
+import textwrap
+from traza_bucle import iteraciones, planificar, trazar_bucle
+
+# Trazas de scripts chicos escritos en un directorio temporal
+
+
+def trazar(tmp_path, codigo):
+    archivo = tmp_path / 'script.py'
+    archivo.write_text(textwrap.dedent(codigo), encoding='utf-8')
+    return trazar_bucle(str(archivo))
+
+def valores(traza, variable):
+    k = traza['variables'].index(variable)
+    return [e[k] for e in traza['estados']]
+
+def test_while_loop_del_repo():
+    traza = trazar_bucle(os.path.join(os.path.dirname(__file__), 'while_loop.py'))
+    assert iteraciones(traza) == 12
+    assert valores(traza, 'paso') == list(range(13))
+    assert traza['continua'] == [True] * 12 + [False]
+    assert traza['salidas'][-1] == 'Paso 12\n'
+    assert traza['salida_despues'] == '¡Objetivo detectado!\n'
+    assert not traza['break']
+
+def test_break_cierra_la_ultima_iteracion(tmp_path):
+    traza = trazar(tmp_path, """\
+        n = 0
+        while True:
+            n += 1
+            print("it", n)
+            if n == 3:
+                break
+        print("despues")
+        """)
+    assert iteraciones(traza) == 3
+    assert valores(traza, 'n') == [0, 1, 2, 3]
+    assert traza['continua'] == [True, True, True, False]
+    assert traza['salidas'] == ['it 1\n', 'it 2\n', 'it 3\n']
+    assert traza['salida_despues'] == 'despues\n'
+    assert traza['break']
+
+def test_break_en_la_ultima_linea_del_script(tmp_path):
+    traza = trazar(tmp_path, """\
+        n = 0
+        while True:
+            n += 1
+            if n == 3:
+                break
+        """)
+    assert iteraciones(traza) == 3
+    assert valores(traza, 'n')[-1] == 3
+    assert traza['continua'][-1] is False and traza['break']
+
+def test_for_con_break_y_else(tmp_path):
+    traza = trazar(tmp_path, """\
+        i = 0
+        for i in range(10):
+            if i == 4: break
+            print(i)
+        else:
+            print("sin break")
+        print("fin", i)
+        """)
+    assert iteraciones(traza) == 5
+    assert traza['salidas'] == ['0\n', '1\n', '2\n', '3\n', '']
+    assert valores(traza, 'i')[-1] == 4
+    assert traza['salida_despues'] == 'fin 4\n'
+
+def test_cuerpo_en_la_linea_del_bucle(tmp_path):
+    traza = trazar(tmp_path, """\
+        paso = 0
+        while paso < 3: paso += 1
+        print("fin", paso)
+        """)
+    assert iteraciones(traza) == 3
+    assert valores(traza, 'paso') == [0, 1, 2, 3]
+    assert traza['continua'] == [True, True, True, False]
+    assert traza['salida_despues'] == 'fin 3\n'
+    assert not traza['break']
+
+def test_for_en_una_linea(tmp_path):
+    traza = trazar(tmp_path, """\
+        for i in range(3): print(i)
+        print("x")
+        """)
+    assert iteraciones(traza) == 3
+    assert traza['salidas'] == ['0\n', '1\n', '2\n']
+    assert traza['salida_despues'] == 'x\n'
+
+def test_bucle_que_no_entra(tmp_path):
+    traza = trazar(tmp_path, """\
+        k = 5
+        while k < 3: k += 1
+        print("nada")
+        """)
+    assert iteraciones(traza) == 0
+    assert traza['continua'] == [False]
+    assert traza['salida_despues'] == 'nada\n'
+
+def test_planificar():
+    assert planificar(3) == [('detalle', 0, 1), ('detalle', 1, 2), ('detalle', 2, 3)]
+    plan = planificar(10_000)
+    assert len(plan) == 6 + 3 + 6
+    assert [p[1:] for p in plan if p[0] == 'salto'][0][0] == 6
+    assert sum(hasta - desde for _, desde, hasta in plan) == 10_000
@@ -0,0 +1,114 @@
+import numpy as np
+from simulador_espectro import (IndiceTransiciones, RANGO_VISIBLE,
+                                calcular_transiciones_arrays, transiciones_de_pares)
+
+# Conjunto de transiciones que se actualiza por niveles.
+# Agregar, quitar o cambiar un nivel recalcula solo sus N-1 pares y los
+# parcha en el índice por longitud de onda: las filas viejas del nivel se
+# marcan como borradas y las nuevas van a un tramo aparte, sin copiar ni
+# reordenar las N² filas (ver IndiceTransiciones). El índice olvida solo
+# las ventanas que tocan las longitudes de onda cambiadas, así que la franja
+# visible se conserva si el cambio cae fuera.
+# Cada cambio queda registrado con una versión para que un espectro ya
+# dibujado sepa si su ventana necesita volver a renderizarse. Se guardan a
+# lo sumo MAXIMO_CAMBIOS; una ventana más vieja que el registro se da por
+# cambiada.
+# Los pares nuevos se calculan antes de tocar nada: si el nivel queda
+# degenerado con otro (ZeroDivisionError) el objeto sigue como estaba.
+
+MAXIMO_CAMBIOS = 256
+
+class TransicionesIncrementales:
+    def __init__(self, niveles, energias=None):
+        if energias is None:  # dict {nivel: energia}
+            niveles, energias = list(niveles.keys()), list(niveles.values())
+        niveles = np.asarray(niveles, dtype=np.int64)
+        energias = np.asarray(energias, dtype=np.float64)
+
+        self.niveles = dict(zip(niveles.tolist(), energias.tolist()))
+        self.indice = IndiceTransiciones(calcular_transiciones_arrays(energias, niveles))
+        self.version = 0
+        self._cambios = []  # (versión, longitudes de onda afectadas, ordenadas)
+        self._olvidada = 0  # última versión descartada por MAXIMO_CAMBIOS
+        self._renderizados = {}  # (λmin, λmax) -> versión dibujada
+
+    @property
+    def transiciones(self):
+        return self.indice.transiciones
+
+    def visibles(self):
+        return self.indice.visibles()
+
+    def ventana(self, lmin, lmax):
+        return self.indice.ventana(lmin, lmax)
+
+    # Pares de `nivel` contra todos los demás niveles (O(N))
+    def _pares_de_nivel(self, nivel, energia):
+        otros = np.fromiter((n for n in self.niveles if n != nivel), dtype=np.int64)
+        energias_otros = np.fromiter((self.niveles[n] for n in otros.tolist()), dtype=np.float64,
+                                     count=len(otros))
+        superior = otros < nivel  # `nivel` es el inicial de estos pares
+        inferior = ~superior
+        return np.concatenate([
+            transiciones_de_pares(np.full(superior.sum(), nivel), np.full(superior.sum(), energia),
+                                  otros[superior], energias_otros[superior]),
+            transiciones_de_pares(otros[inferior], energias_otros[inferior],
+                                  np.full(inferior.sum(), nivel), np.full(inferior.sum(), energia))
+        ])
+
+    def _quitar_pares(self, nivel):
+        return self.indice.eliminar_nivel(nivel)
+
+    def _registrar(self, *filas):
+        longitudes = np.sort(np.concatenate([f['longitud_onda_nm'] for f in filas]))
+        self.version += 1
+        self._cambios.append((self.version, longitudes))
+        if len(self._cambios) > MAXIMO_CAMBIOS:
+            self._olvidada = self._cambios.pop(0)[0]
+
+    # Operaciones delta ------------------------------------------------------
+
+    def agregar_nivel(self, nivel, energia):
+        if nivel in self.niveles:
+            raise KeyError(f"El nivel {nivel} ya existe; use modificar_nivel")
+        nuevas = self._pares_de_nivel(nivel, float(energia))
+        self.niveles[nivel] = float(energia)
+        self.indice.insertar(nuevas)
+        self._registrar(nuevas)
+
+    def eliminar_nivel(self, nivel):
+        if nivel not in self.niveles:
+            raise KeyError(f"El nivel {nivel} no existe")
+        del self.niveles[nivel]
+        self._registrar(self._quitar_pares(nivel))
+
+    def modificar_nivel(self, nivel, energia):
+        if nivel not in self.niveles:
+            raise KeyError(f"El nivel {nivel} no existe")
+        nuevas = self._pares_de_nivel(nivel, float(energia))
+        self.niveles[nivel] = float(energia)
+        quitadas = self._quitar_pares(nivel)
+        self.indice.insertar(nuevas)
+        self._registrar(quitadas, nuevas)
+
+    # Invalidación de espectros dibujados ------------------------------------
+
+    # ¿Cambió algo dentro de [λmin, λmax] desde el último marcar_renderizado?
+    def necesita_render(self, lmin=RANGO_VISIBLE[0], lmax=RANGO_VISIBLE[1]):
+        visto = self._renderizados.get((lmin, lmax))
+        if visto is None or visto < self._olvidada:
+            return True
+        for version, longitudes in reversed(self._cambios):
+            if version <= visto:
+                break
+            i = np.searchsorted(longitudes, lmin, side='left')
+            if i < len(longitudes) and longitudes[i] <= lmax:
+                return True
+        return False
+
+    def marcar_renderizado(self, lmin=RANGO_VISIBLE[0], lmax=RANGO_VISIBLE[1]):
+        self._renderizados[(lmin, lmax)] = self.version
+        # Los cambios ya vistos por todas las ventanas no se necesitan más
+        minimo = min(self._renderizados.values())
+        self._cambios = [c for c in self._cambios if c[0] > minimo]
+
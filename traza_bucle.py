@@ -0,0 +1,218 @@
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Traza de ejecución de un bucle, para animar el script que se muestra en
+# pantalla en lugar de reimplementarlo a mano en la escena.
+# El script se ejecuta una vez bajo sys.settrace; cada vez que el cursor pasa
+# por la línea del bucle (la evaluación de la condición, o el siguiente
+# elemento en un for) se guarda el valor de las variables del módulo, y la
+# salida impresa se reparte entre iteraciones. Si el bucle termina con break
+# (el cursor pasa a una línea posterior sin volver a evaluarlo) la última
+# iteración se cierra ahí, con el estado que deja el break. Un cuerpo escrito
+# en la misma línea del bucle se traza con sus líneas corridas al final del
+# archivo, así cada evaluación se distingue del cuerpo. La traza es chica (una fila
+# de valores por iteración) y se guarda en disco por hash del código, así que
+# editar el script cambia la animación y no volver a tocarlo no cuesta nada.
+#
+# planificar() arma el presupuesto de cuadros: las primeras y últimas
+# iteraciones en detalle y el medio en unos pocos saltos, de modo que el
+# costo de render no depende de cuántas vueltas dé el bucle.
+
+DIRECTORIO_CACHE_TRAZAS = '.cache_trazas'
+VERSION_TRAZA = 2
+MAX_ITERACIONES = 1_000_000
+
+# Variables asignadas en el nivel principal, en orden de aparición
+def _variables_modulo(arbol):
+    nombres = []
+    pendientes = list(arbol.body)
+    while pendientes:
+        nodo = pendientes.pop(0)
+        if isinstance(nodo, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        if isinstance(nodo, ast.Name) and isinstance(nodo.ctx, ast.Store) and nodo.id not in nombres:
+            nombres.append(nodo.id)
+        pendientes[:0] = list(ast.iter_child_nodes(nodo))
+    return nombres
+
+# Primer bucle while/for del nivel principal
+def _primer_bucle(arbol):
+    for nodo in arbol.body:
+        if isinstance(nodo, (ast.While, ast.For)):
+            return nodo
+    return None
+
+def _valor(v):
+    if v is None or isinstance(v, (bool, int, float, str)):
+        return v
+    return repr(v)
+
+# Ejecutar el script y registrar estado y salida por iteración
+def trazar_bucle(archivo, max_iteraciones=MAX_ITERACIONES):
+    with open(archivo, encoding='utf-8') as f:
+        fuente = f.read()
+    arbol = ast.parse(fuente)
+    bucle = _primer_bucle(arbol)
+    if bucle is None:
+        raise ValueError(f"'{archivo}' no tiene un bucle en el nivel principal")
+
+    if isinstance(bucle, ast.While):
+        condicion = ast.get_source_segment(fuente, bucle.test)
+    else:
+        condicion = f"{ast.get_source_segment(fuente, bucle.target)} in {ast.get_source_segment(fuente, bucle.iter)}"
+    if bucle.body[0].lineno == bucle.lineno:
+        # Cuerpo en la línea del bucle (`while x: x += 1`): para la traza se
+        # corre a líneas que no existen, si no sus eventos no se distinguen
+        desplazamiento = max(len(fuente.splitlines()), bucle.end_lineno)
+        for nodo in bucle.body:
+            ast.increment_lineno(nodo, desplazamiento)
+    cuerpo = (bucle.body[0].lineno, bucle.body[-1].end_lineno)
+    fuera = (bucle.lineno, bucle.end_lineno)  # líneas fuera de este rango: después del bucle
+    codigo = compile(arbol, os.path.abspath(archivo), 'exec')
+    espacio = {'__name__': '__traza__', '__file__': os.path.abspath(archivo)}
+    salida = io.StringIO()
+
+    estados = []      # variables cada vez que se evalúa el bucle
+    salidas = []      # texto impreso en cada iteración
+    antes = []        # [texto impreso antes del bucle]
+    pendiente = []    # evaluación del bucle esperando saber si entra al cuerpo
+    terminado = []    # [True] cuando el bucle ya terminó (condición falsa o break)
+
+    def cortar():
+        texto = salida.getvalue()
+        salida.seek(0)
+        salida.truncate()
+        return texto
+
+    def estado(variables):
+        return [{n: _valor(variables[n]) for n in nombres if n in variables}, True]
+
+    # Cerrar la iteración en curso al salir con break: su salida y el estado
+    # que deja, como una última evaluación que no continúa
+    def cerrar_por_break(variables):
+        salidas.append(cortar())
+        estados.append(estado(variables))
+        estados[-1][1] = False
+        terminado.append(True)
+        corte.append(True)
+
+    corte = []
+
+    def local(frame, evento, arg):
+        if evento != 'line' or terminado:
+            return local
+        linea = frame.f_lineno
+        if pendiente:
+            if cuerpo[0] <= linea <= cuerpo[1]:
+                pendiente.clear()
+            elif linea != bucle.lineno:
+                pendiente.clear()
+                estados[-1][1] = False
+                terminado.append(True)
+                return local
+        elif estados and not (fuera[0] <= linea <= fuera[1] or cuerpo[0] <= linea <= cuerpo[1]):
+            cerrar_por_break(frame.f_globals)
+            return local
+        if linea == bucle.lineno and not pendiente:
+            texto = cortar()
+            if estados:
+                salidas.append(texto)
+            else:
+                antes.append(texto)
+            if len(estados) > max_iteraciones:
+                raise RuntimeError(f"El bucle superó {max_iteraciones} iteraciones")
+            estados.append(estado(frame.f_globals))
+            pendiente.append(linea)
+        return local
+
+    def global_(frame, evento, arg):
+        return local if frame.f_code is codigo else None
+
+    nombres = _variables_modulo(arbol)
+    anterior = sys.gettrace()
+    sys.settrace(global_)
+    try:
+        with contextlib.redirect_stdout(salida):
+            exec(codigo, espacio)
+    finally:
+        sys.settrace(anterior)
+    if pendiente:
+        estados[-1][1] = False
+    elif estados and not terminado:
+        cerrar_por_break(espacio)  # break en la última línea del script
+
+    # Solo variables simples; la variable de un for aparece desde la segunda evaluación
+    visibles = [n for n in nombres if estados and n in estados[-1][0]
+                and isinstance(estados[-1][0][n], (bool, int, float, str))]
+    return {
+        'version': VERSION_TRAZA,
+        'archivo': os.path.basename(archivo),
+        'tipo': 'while' if isinstance(bucle, ast.While) else 'for',
+        'linea': bucle.lineno,
+        'condicion': condicion,
+        'variables': visibles,
+        'estados': [[e[0].get(n) for n in visibles] for e in estados],
+        'continua': [e[1] for e in estados],
+        'break': bool(corte),
+        'salida_antes': antes[0] if antes else '',
+        'salidas': salidas,
+        'salida_despues': cortar()
+    }
+
+# Traza guardada en disco por hash del código (y de la versión de Python)
+def traza_cacheada(archivo, directorio=DIRECTORIO_CACHE_TRAZAS):
+    with open(archivo, 'rb') as f:
+        contenido = f.read()
+    clave = hashlib.sha256(contenido + repr((VERSION_TRAZA, sys.version_info[:2])).encode()).hexdigest()
+    ruta = os.path.join(directorio, f'{clave}.json')
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            pass
+
+    traza = trazar_bucle(archivo)
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=directorio, prefix='.tmp-')
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(traza, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temporal, ruta)
+    return traza
+
+def iteraciones(traza):
+    return len(traza['salidas'])
+
+# Segmentos de animación (tipo, desde, hasta) sobre las iteraciones [desde, hasta):
+# 'detalle' para las primeras `inicio` y las últimas `fin`, y a lo sumo
+# `saltos` segmentos 'salto' que cubren el medio
+def planificar(n, inicio=6, fin=6, saltos=3):
+    if n <= inicio + fin:
+        return [('detalle', i, i + 1) for i in range(n)]
+    a, b = inicio, n - fin
+    saltos = max(1, min(saltos, b - a))
+    cortes = [a + (b - a) * k // saltos for k in range(saltos + 1)]
+    return ([('detalle', i, i + 1) for i in range(a)]
+            + [('salto', cortes[k], cortes[k + 1]) for k in range(saltos)]
+            + [('detalle', i, i + 1) for i in range(b, n)])
+
+
+# Programa principal: mostrar la traza de un script
+if __name__ == "__main__":
+    archivo = sys.argv[1] if len(sys.argv) > 1 else 'while_loop.py'
+    traza = trazar_bucle(archivo)
+    print(f"{traza['tipo']} en la línea {traza['linea']}: {traza['condicion']}")
+    print(f"Variables: {', '.join(traza['variables'])}; {iteraciones(traza)} iteraciones")
+    for estado, continua, texto in zip(traza['estados'], traza['continua'], traza['salidas'] + [None]):
+        print(f"  {dict(zip(traza['variables'], estado))} → {continua}"
+              + (f"  imprime {texto!r}" if texto else ''))
+    if traza['break']:
+        print("  (termina con break)")
+    print(f"Después del bucle: {traza['salida_despues']!r}")
+    print(f"Plan: {planificar(iteraciones(traza))}")